@@ -6,26 +6,182 @@ This script applies security settings using unique certificates for each PC.
 Works on Windows and Linux systems.
 """
 
+import io
 import os
 import re
+import sys
 import glob
+import json
+import hashlib
 import platform
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, List, Optional, Tuple
+
+# Access Control lines (plugin, governance/permissions documents) removed before patching:
+# fixed text, so they are matched per line with startswith / == instead of regex.
+# C++ files are patched as bytes (no decode/encode round trip), so every marker and pattern is bytes
+_ACCESS_PROPERTY_PREFIX = b'pqos.properties().properties().emplace_back("dds.sec.access.'
+_GOV_COMMENT = b'// Governance and Permissions Documents'
+
+
+def _is_access_line(line: bytes) -> bool:
+    stripped = line.strip()
+    return stripped.startswith(_ACCESS_PROPERTY_PREFIX) or stripped == _GOV_COMMENT
+
+
+# Dynamic code block: from the resolve_dds_root lambda (and its comment) to the dds_root variable
+_DYNAMIC_BLOCK_START = b"auto resolve_dds_root = []() -> std::filesystem::path {"
+_DYNAMIC_BLOCK_COMMENT = b"// Resolve DDS root directory dynamically"
+_DYNAMIC_BLOCK_END = b"dds_root = resolve_dds_root();"
+_RE_BRACE = re.compile(rb'[{}]')
+# Includes the dynamic code needs, added after the last include when missing
+_DYNAMIC_PATH_INCLUDES = (b"#include <filesystem>", b"#include <unistd.h>", b"#include <cstring>")
+
+
+def _find_dynamic_blocks(content: bytes) -> List[Tuple[int, int]]:
+    """(start, end) spans of complete dynamic code blocks, found with find and a brace-depth scan."""
+    spans = []
+    pos = content.find(_DYNAMIC_BLOCK_START)
+    while pos != -1:
+        # Walk the lambda body's braces to its closing one
+        i = pos + len(_DYNAMIC_BLOCK_START)
+        depth = 1
+        for brace in _RE_BRACE.finditer(content, i):
+            depth += 1 if brace.group() == b'{' else -1
+            if not depth:
+                i = brace.end()
+                break
+        next_pos = content.find(_DYNAMIC_BLOCK_START, i)
+        end = content.find(_DYNAMIC_BLOCK_END, i, next_pos if next_pos != -1 else len(content))
+        if not depth and end != -1:
+            # Block starts at its comment line when there is one, plus the blank lines before it
+            start = content.rfind(b'\n', 0, pos) + 1
+            comment = content.rfind(b'\n', 0, max(start - 1, 0)) + 1
+            if content[comment:start].strip().startswith(_DYNAMIC_BLOCK_COMMENT):
+                start = comment
+            start = content.find(b'\n', len(content[:start].rstrip())) + 1
+            end = content.find(b'\n', end)
+            spans.append((start, len(content) if end == -1 else end + 1))
+        pos = next_pos
+    return spans
+
+
+# Patterns used on every patched file, compiled once at import
+_RE_INCLUDE = re.compile(rb'(#include\s+["<][^">]+[">])')
+# Old (hardcoded path) security block, and the participant QoS section it is replaced in
+_RE_OLD_SECURITY_BLOCK = re.compile(rb'//\s*DDS Security Configuration.*?//\s*Access Control disabled.*?(?=\n\s*pqos\.name\(|$)', re.DOTALL)
+_RE_OLD_PARTICIPANT_BLOCK = re.compile(rb'(//\s*Create the participant\s*\n)?\s*DomainParticipantQos\s+pqos\s*=\s*PARTICIPANT_QOS_DEFAULT;.*?//\s*Access Control disabled.*?(?=\n\s*pqos\.name\(|$)', re.DOTALL)
+_RE_PARTICIPANT = re.compile(rb'(\s*//\s*Create the participant\s*\n)?\s*(DomainParticipantQos\s+pqos\s*=\s*PARTICIPANT_QOS_DEFAULT;)')
+# Writer/reader QoS declarations the encryption property is added after, found in one pass
+_RE_ENDPOINT_QOS = re.compile(rb'(?P<writer>DataWriterQos\s+writer_qos\s*=\s*DATAWRITER_QOS_DEFAULT;)'
+                              rb'|(?P<reader>DataReaderQos\s+reader_qos\s*=\s*DATAREADER_QOS_DEFAULT;)')
+
+# Substrings the add_* steps branch on; probed once per file (see _probe_content)
+_PROBE_MARKERS = {
+    'auth_plugin': b'dds.sec.auth.plugin',
+    'payload_protection': b'rtps.payload_protection',
+    'resolve_dds_root': b'resolve_dds_root',
+    'gethostname': b'gethostname',
+    'participant_dir': b'participant_dir',
+    'home_path': b'file:///home/',
+    'windows_path': b'file://C:',
+    'writer_qos': b'DataWriterQos',
+    'reader_qos': b'DataReaderQos',
+}
+
+# C++ inserted at the start of the participant constructor: resolves the DDS root and hostname at runtime
+_DYNAMIC_PATH_CODE = """
+    // Resolve DDS root directory dynamically (portable across PCs)
+    auto resolve_dds_root = []() -> std::filesystem::path {
+        if (const char* env_root = std::getenv("DDS_ROOT")) {
+            std::filesystem::path p(env_root);
+            if (std::filesystem::exists(p)) return p;
+        }
+        // Walk upwards from current directory to find repo root (has secure_dds and IDL)
+        std::filesystem::path cur = std::filesystem::current_path();
+        for (int i = 0; i < 6 && !cur.empty(); ++i) {
+            if (std::filesystem::exists(cur / "secure_dds") && std::filesystem::exists(cur / "IDL")) {
+                return cur;
+            }
+            cur = cur.parent_path();
+        }
+        return std::filesystem::current_path();
+    };
+    
+    // Detect hostname dynamically (portable across PCs)
+    char hostname[256] = {0};
+    if (gethostname(hostname, sizeof(hostname) - 1) != 0) {
+        std::strcpy(hostname, "UNKNOWN_HOST");
+    }
+    std::string participant_dir = std::string(hostname);
+    
+    const std::filesystem::path dds_root = resolve_dds_root();
+"""
+
+# Participant QoS with authentication + encryption properties, following _DYNAMIC_PATH_CODE
+_PARTICIPANT_SECURITY_CODE = """
+    // Create the participant
+    DomainParticipantQos pqos = PARTICIPANT_QOS_DEFAULT;
+    // DDS Security Configuration - Authentication + Encryption Only
+    pqos.properties().properties().emplace_back("dds.sec.auth.plugin", "builtin.PKI-DH");
+    // Access Control disabled to avoid permissions issues
+    pqos.properties().properties().emplace_back("dds.sec.crypto.plugin", "builtin.AES-GCM-GMAC");
+    
+    // Certificate and Key Paths (dynamic, portable across PCs)
+    const std::string uri_prefix = "file://";
+    const std::filesystem::path ca_path = dds_root / "secure_dds/CA/mainca_cert.pem";
+    const std::filesystem::path cert_path = dds_root / "secure_dds/participants" / participant_dir / (participant_dir + "_cert.pem");
+    const std::filesystem::path key_path = dds_root / "secure_dds/participants" / participant_dir / (participant_dir + "_key.pem");
+    
+    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.identity_ca", uri_prefix + ca_path.string());
+    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.identity_certificate", uri_prefix + cert_path.string());
+    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.private_key", uri_prefix + key_path.string());
+    
+    // Access Control disabled - no governance/permissions needed"""
+
+_SECURITY_CODE = (_DYNAMIC_PATH_CODE + _PARTICIPANT_SECURITY_CODE).encode()
+
+# Files a run found already patched, keyed by path: [st_mtime_ns, st_size]; skipped by later runs until they change
+_PATCH_CACHE_NAME = '.patcher_cache.json'
+
+# Per-file counters in self.stats that patch_cpp_file increments (merged back from worker processes)
+_COUNTED_STATS = ('participants_secured', 'writers_secured', 'readers_secured')
+
+# Payload encryption property added after a writer_qos/reader_qos declaration
+_ENCRYPTION_CODE_TEMPLATE = """
+    // Payload Encryption Configuration
+    {qos_var}.properties().properties().emplace_back("{payload_protection}", "{encrypt_value}");"""
+
+
+def _detect_pc_name():
+    """Automatically detect PC name."""
+    try:
+        import socket
+        return socket.gethostname()
+    except:
+        return "UNKNOWN_PC"
+
+
+# Host facts, looked up once per process instead of per patcher instance
+_OS_TYPE = platform.system().lower()  # 'windows', 'linux', 'darwin'
+_PC_NAME = _detect_pc_name()
+
 
 class DDSSecurityPatcher:
     def __init__(self):
         """Initialize the DDS Security Patcher class."""
         
         # Operating system detection
-        self.os_type = platform.system().lower()  # 'windows', 'linux', 'darwin'
+        self.os_type = _OS_TYPE
         
         # Dynamic path detection
         self.project_root = self._detect_project_root()
         self.secure_dds_path = Path(self.project_root) / "secure_dds"
         
         # Detect PC name
-        self.pc_name = self._detect_pc_name()
+        self.pc_name = _PC_NAME
         self.pc_cert_path = self.secure_dds_path / "participants" / self.pc_name
         
         # Cross-platform path handling for C++ escape sequences
@@ -56,6 +212,9 @@ class DDSSecurityPatcher:
             'payload_protection': 'rtps.payload_protection',
             'encrypt_value': 'ENCRYPT'
         }
+        # Encryption property lines, rendered once for every file
+        self._writer_encryption_code = _ENCRYPTION_CODE_TEMPLATE.format(qos_var='writer_qos', **self.encryption_properties).encode()
+        self._reader_encryption_code = _ENCRYPTION_CODE_TEMPLATE.format(qos_var='reader_qos', **self.encryption_properties).encode()
         
         # Processing statistics
         self.stats = {
@@ -120,23 +279,16 @@ class DDSSecurityPatcher:
         
         return str(project_root.absolute())
     
-    def _detect_pc_name(self):
-        """Automatically detect PC name."""
-        try:
-            import socket
-            return socket.gethostname()
-        except:
-            return "UNKNOWN_PC"
-    
     def check_portability(self) -> bool:
         """Check project portability."""
         print("🔍 Checking portability...")
+        # project_root is a str: plain os.path checks, no Path object per entry
+        root = self.project_root
         
         # Check required folders
         required_dirs = ['secure_dds', 'IDL', 'docs']
         for dir_name in required_dirs:
-            dir_path = Path(self.project_root) / dir_name
-            if not dir_path.exists():
+            if not os.path.isdir(os.path.join(root, dir_name)):
                 print(f"❌ Required folder not found: {dir_name}")
                 return False
         
@@ -150,8 +302,7 @@ class DDSSecurityPatcher:
         ]
         
         for cert_file in cert_files:
-            file_path = Path(self.project_root) / cert_file
-            if not file_path.exists():
+            if not os.path.exists(os.path.join(root, cert_file)):
                 print(f"❌ Certificate file not found: {cert_file}")
                 return False
         
@@ -164,177 +315,118 @@ class DDSSecurityPatcher:
         search_path = Path(self.project_root) / "IDL"
         
         if search_path.exists():
-            for folder in search_path.glob("*_idl_generated"):
-                if folder.is_dir():
-                    folders.append(str(folder))
+            # One directory listing; DirEntry.is_dir() uses the cached entry type
+            with os.scandir(search_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith("_idl_generated") and entry.is_dir():
+                        folders.append(entry.path)
         
         return folders
     
-    def _remove_access_control_lines(self, content: str) -> str:
+    def _probe_content(self, content: bytes) -> dict:
+        """Presence of every marker in _PROBE_MARKERS, one bytes.find per marker."""
+        return {key: content.find(marker) != -1 for key, marker in _PROBE_MARKERS.items()}
+    
+    def _remove_access_control_lines(self, content: bytes) -> bytes:
         """Clear existing Access Control lines."""
-        import re
-        
-        # Remove Access Control plugin line
-        content = re.sub(r'\s*pqos\.properties\(\)\.properties\(\)\.emplace_back\("dds\.sec\.access\.plugin", "builtin\.Access-Permissions"\);\s*\n?', '', content)
-        
-        # Remove Governance and Permissions lines
-        content = re.sub(r'\s*// Governance and Permissions Documents\s*\n', '', content)
-        content = re.sub(r'\s*pqos\.properties\(\)\.properties\(\)\.emplace_back\("dds\.sec\.access\.builtin\.Access-Permissions\.governance", "[^"]*"\);\s*\n?', '', content)
-        content = re.sub(r'\s*pqos\.properties\(\)\.properties\(\)\.emplace_back\("dds\.sec\.access\.builtin\.Access-Permissions\.permissions", "[^"]*"\);\s*\n?', '', content)
-        content = re.sub(r'\s*pqos\.properties\(\)\.properties\(\)\.emplace_back\("dds\.sec\.access\.builtin\.Access-Permissions\.permissions_ca", "[^"]*"\);\s*\n?', '', content)
-        
-        return content
+        if b'dds.sec.access.' not in content and _GOV_COMMENT not in content:
+            return content
+        # Drop Access Control plugin and Governance and Permissions lines whole, in one pass
+        return b''.join(line for line in content.splitlines(keepends=True) if not _is_access_line(line))
     
-    def _remove_duplicate_dynamic_code(self, content: str) -> Tuple[str, bool]:
+    def _remove_duplicate_dynamic_code(self, content: bytes) -> Tuple[bytes, bool]:
         """Cleans duplicate dynamic code blocks."""
         modified = False
         
-        # Count resolve_dds_root lambda
-        resolve_dds_root_count = content.count("auto resolve_dds_root = []() -> std::filesystem::path {")
+        # Find each resolve_dds_root block up to its dds_root = resolve_dds_root() line (one pass, no separate count)
+        spans = _find_dynamic_blocks(content)
         
         # If more than one exists, keep the first and remove others
-        if resolve_dds_root_count > 1:
-            print(f"    🔧 {resolve_dds_root_count} duplicate dynamic code blocks detected, cleaning...")
-            
-            # Find end of first block (after dds_root = resolve_dds_root() line)
-            # Capture complete dynamic code block: from resolve_dds_root to dds_root variable
-            # More flexible pattern: flexible with comment lines, spaces, etc.
-            pattern = r'(?:^|\n)\s*(?://\s*Resolve DDS root directory dynamically.*?\n\s*)?auto resolve_dds_root\s*=\s*\[\]\(\)\s*->\s*std::filesystem::path\s*\{[^}]*\};\s*\n\s*\n\s*(?://\s*Detect hostname dynamically.*?\n\s*)?char hostname\[256\]\s*=\s*\{0\};\s*\n\s*if\s*\(gethostname\(hostname[^)]*\)\s*!=\s*0\)\s*\{[^}]*\}\s*\n\s*std::string participant_dir\s*=\s*std::string\(hostname\);\s*\n\s*\n\s*const std::filesystem::path dds_root\s*=\s*resolve_dds_root\(\);\s*\n'
+        if len(spans) > 1:
+            print(f"    🔧 {len(spans)} duplicate dynamic code blocks detected, cleaning...")
             
-            matches = list(re.finditer(pattern, content, re.DOTALL | re.MULTILINE))
-            
-            if len(matches) > 1:
-                # Keep first block, remove others (starting from the end)
-                for match in reversed(matches[1:]):  # All except first
-                    # Also clean newline at start of match
-                    start = match.start()
-                    if start > 0 and content[start-1] == '\n':
-                        start -= 1
-                    content = content[:start] + content[match.end():]
-                modified = True
-                print(f"    ✓ {len(matches) - 1} duplicate dynamic code blocks cleaned")
+            kept = [content[:spans[1][0]]]
+            for (_, prev_end), (start, _) in zip(spans[1:], spans[2:]):
+                kept.append(content[prev_end:start])
+            kept.append(content[spans[-1][1]:])
+            content = b''.join(kept)
+            modified = True
+            print(f"    ✓ {len(spans) - 1} duplicate dynamic code blocks cleaned")
         
         return content, modified
     
-    def _ensure_dynamic_path_includes(self, content: str) -> Tuple[str, bool]:
+    def _ensure_dynamic_path_includes(self, content: bytes) -> Tuple[bytes, bool]:
         """Adds required includes (filesystem, unistd.h, cstring)."""
         modified = False
         # Check includes
-        needs_filesystem = "#include <filesystem>" not in content
-        needs_unistd = "#include <unistd.h>" not in content
-        needs_cstring = "#include <cstring>" not in content
+        additional_includes = [include for include in _DYNAMIC_PATH_INCLUDES if include not in content]
         
-        if needs_filesystem or needs_unistd or needs_cstring:
+        if additional_includes:
             # Find last include (usually after fastdds or json includes)
-            include_pattern = r'(#include\s+["<][^">]+[">])'
-            matches = list(re.finditer(include_pattern, content))
+            # Only the last include matters: keep its end instead of materializing every match
+            last_include_pos = -1
+            for match in _RE_INCLUDE.finditer(content):
+                last_include_pos = match.end()
             
-            if matches:
+            if last_include_pos != -1:
                 # Add after last include
-                last_include_pos = matches[-1].end()
-                additional_includes = []
-                
-                if needs_filesystem:
-                    additional_includes.append("#include <filesystem>")
-                if needs_unistd:
-                    additional_includes.append("#include <unistd.h>")
-                if needs_cstring:
-                    additional_includes.append("#include <cstring>")
-                
-                if additional_includes:
-                    content = content[:last_include_pos] + "\n" + "\n".join(additional_includes) + content[last_include_pos:]
-                    modified = True
-                    print("    ➕ Required includes for dynamic path added")
+                content = b"".join((content[:last_include_pos], b"\n", b"\n".join(additional_includes), content[last_include_pos:]))
+                modified = True
+                print("    ➕ Required includes for dynamic path added")
         
         return content, modified
     
-    def add_security_to_participant(self, content: str) -> Tuple[str, bool]:
+    def add_security_to_participant(self, content: bytes, probe: Optional[dict] = None) -> Tuple[bytes, bool]:
         """Adds or updates security settings to DomainParticipant QoS."""
         modified = False
+        if probe is None:
+            probe = self._probe_content(content)
+        
+        # Cheap literal checks first: an already secured file with no Access Control lines, duplicate
+        # dynamic blocks or missing includes has nothing to clean up
+        already_clean = (probe['auth_plugin'] and probe['resolve_dds_root']
+                         and b'dds.sec.access.' not in content and _GOV_COMMENT not in content
+                         and content.count(_DYNAMIC_BLOCK_START) <= 1
+                         and all(include in content for include in _DYNAMIC_PATH_INCLUDES))
+        
+        if not already_clean:
+            # Access Control disabled - perform cleanup
+            cleaned = self._remove_access_control_lines(content)
+            # Removed access lines may have carried markers (e.g. hardcoded governance paths): re-probe
+            if len(cleaned) != len(content):
+                probe = self._probe_content(cleaned)
+            content = cleaned
+            
+            # First clean duplicate dynamic code blocks
+            content, duplicate_removed = self._remove_duplicate_dynamic_code(content)
+            if duplicate_removed:
+                modified = True
+            
+            # Add required includes for dynamic path resolution
+            content, includes_modified = self._ensure_dynamic_path_includes(content)
+            if includes_modified:
+                modified = True
         
-        # Access Control disabled - perform cleanup
-        content = self._remove_access_control_lines(content)
-        
-        # First clean duplicate dynamic code blocks
-        content, duplicate_removed = self._remove_duplicate_dynamic_code(content)
-        if duplicate_removed:
-            modified = True
-        
-        # Add required includes for dynamic path resolution
-        content, includes_modified = self._ensure_dynamic_path_includes(content)
-        if includes_modified:
-            modified = True
-        
-        # Add dynamic path resolution code (at constructor start)
-        # Add Resolve DDS root and hostname code
-        dynamic_path_code = """
-    // Resolve DDS root directory dynamically (portable across PCs)
-    auto resolve_dds_root = []() -> std::filesystem::path {
-        if (const char* env_root = std::getenv("DDS_ROOT")) {
-            std::filesystem::path p(env_root);
-            if (std::filesystem::exists(p)) return p;
-        }
-        // Walk upwards from current directory to find repo root (has secure_dds and IDL)
-        std::filesystem::path cur = std::filesystem::current_path();
-        for (int i = 0; i < 6 && !cur.empty(); ++i) {
-            if (std::filesystem::exists(cur / "secure_dds") && std::filesystem::exists(cur / "IDL")) {
-                return cur;
-            }
-            cur = cur.parent_path();
-        }
-        return std::filesystem::current_path();
-    };
-    
-    // Detect hostname dynamically (portable across PCs)
-    char hostname[256] = {0};
-    if (gethostname(hostname, sizeof(hostname) - 1) != 0) {
-        std::strcpy(hostname, "UNKNOWN_HOST");
-    }
-    std::string participant_dir = std::string(hostname);
-    
-    const std::filesystem::path dds_root = resolve_dds_root();
-"""
-        
+        # Dynamic path resolution code (at constructor start) comes from _SECURITY_CODE
         # First check if dynamic code block already exists (don't add again if it exists)
-        if "resolve_dds_root" in content and "gethostname" in content and "participant_dir" in content:
+        if probe['resolve_dds_root'] and probe['gethostname'] and probe['participant_dir']:
             # Dynamic code already exists, just check security settings
-            if "dds.sec.auth.plugin" in content:
+            if probe['auth_plugin']:
                 print("    ✓ Dynamic path code already exists, checking security settings...")
                 # Only add security settings if missing, otherwise do nothing
-                if "pqos.properties().properties().emplace_back(\"dds.sec.auth.plugin\"" not in content:
+                if b"pqos.properties().properties().emplace_back(\"dds.sec.auth.plugin\"" not in content:
                     print("    ⚠️  Security settings appear missing but dynamic code exists - file probably already correct")
-                return content, False
+                # Nothing to add, but duplicate-block / include cleanup above still has to be written
+                return content, modified
         
         # Replace existing certificate paths with dynamic code (if hardcoded paths exist)
-        old_security_block_pattern = r'//\s*DDS Security Configuration.*?//\s*Access Control disabled.*?(?=\n\s*pqos\.name\(|$)'
-        if re.search(old_security_block_pattern, content, re.DOTALL):
+        if _RE_OLD_SECURITY_BLOCK.search(content):
             # Check for hardcoded paths
-            if "file:///home/" in content or "file://C:" in content or "file://C:\\\\" in content:
+            if probe['home_path'] or probe['windows_path']:
                 # Replace existing security block with dynamic code
-                new_security_code = dynamic_path_code + """
-    // Create the participant
-    DomainParticipantQos pqos = PARTICIPANT_QOS_DEFAULT;
-    // DDS Security Configuration - Authentication + Encryption Only
-    pqos.properties().properties().emplace_back("dds.sec.auth.plugin", "builtin.PKI-DH");
-    // Access Control disabled to avoid permissions issues
-    pqos.properties().properties().emplace_back("dds.sec.crypto.plugin", "builtin.AES-GCM-GMAC");
-    
-    // Certificate and Key Paths (dynamic, portable across PCs)
-    const std::string uri_prefix = "file://";
-    const std::filesystem::path ca_path = dds_root / "secure_dds/CA/mainca_cert.pem";
-    const std::filesystem::path cert_path = dds_root / "secure_dds/participants" / participant_dir / (participant_dir + "_cert.pem");
-    const std::filesystem::path key_path = dds_root / "secure_dds/participants" / participant_dir / (participant_dir + "_key.pem");
-    
-    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.identity_ca", uri_prefix + ca_path.string());
-    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.identity_certificate", uri_prefix + cert_path.string());
-    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.private_key", uri_prefix + key_path.string());
-    
-    // Access Control disabled - no governance/permissions needed"""
-                
                 # Find and replace old block (preserve DomainParticipantQos line)
-                old_pattern = r'(//\s*Create the participant\s*\n)?\s*DomainParticipantQos\s+pqos\s*=\s*PARTICIPANT_QOS_DEFAULT;.*?//\s*Access Control disabled.*?(?=\n\s*pqos\.name\(|$)'
-                if re.search(old_pattern, content, re.DOTALL):
-                    content = re.sub(old_pattern, new_security_code, content, flags=re.DOTALL)
+                if _RE_OLD_PARTICIPANT_BLOCK.search(content):
+                    content = _RE_OLD_PARTICIPANT_BLOCK.sub(_SECURITY_CODE, content)
                     modified = True
                     print("    🔄 Hardcoded certificate paths replaced with dynamic code")
                     self.stats['participants_secured'] += 1
@@ -342,145 +434,161 @@ class DDSSecurityPatcher:
             else:
                 # Dynamic code already exists but no hardcoded path, do nothing
                 print("    ✓ Dynamic code already exists and appears correct")
-                return content, False
+                return content, modified
         
         # If security settings don't exist, add with dynamic code
-        if "dds.sec.auth.plugin" not in content:
+        if not probe['auth_plugin']:
             # Find DomainParticipantQos creation location
-            participant_pattern = r'(\s*//\s*Create the participant\s*\n)?\s*(DomainParticipantQos\s+pqos\s*=\s*PARTICIPANT_QOS_DEFAULT;)'
-            match = re.search(participant_pattern, content)
+            match = _RE_PARTICIPANT.search(content)
             
             if match:
                 # Add dynamic path resolution + security properties
-                security_code = dynamic_path_code + """
-    // Create the participant
-    DomainParticipantQos pqos = PARTICIPANT_QOS_DEFAULT;
-    // DDS Security Configuration - Authentication + Encryption Only
-    pqos.properties().properties().emplace_back("dds.sec.auth.plugin", "builtin.PKI-DH");
-    // Access Control disabled to avoid permissions issues
-    pqos.properties().properties().emplace_back("dds.sec.crypto.plugin", "builtin.AES-GCM-GMAC");
-    
-    // Certificate and Key Paths (dynamic, portable across PCs)
-    const std::string uri_prefix = "file://";
-    const std::filesystem::path ca_path = dds_root / "secure_dds/CA/mainca_cert.pem";
-    const std::filesystem::path cert_path = dds_root / "secure_dds/participants" / participant_dir / (participant_dir + "_cert.pem");
-    const std::filesystem::path key_path = dds_root / "secure_dds/participants" / participant_dir / (participant_dir + "_key.pem");
-    
-    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.identity_ca", uri_prefix + ca_path.string());
-    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.identity_certificate", uri_prefix + cert_path.string());
-    pqos.properties().properties().emplace_back("dds.sec.auth.builtin.PKI-DH.private_key", uri_prefix + key_path.string());
-    
-    // Access Control disabled - no governance/permissions needed"""
-                
-                # Add security code
                 old_line = match.group(0)
                 # If "Create the participant" comment doesn't exist, add it
-                if "Create the participant" not in old_line:
-                    new_line = security_code
+                if b"Create the participant" not in old_line:
+                    new_line = _SECURITY_CODE
                 else:
-                    new_line = security_code.replace("// Create the participant", match.group(1).strip() if match.group(1) else "// Create the participant")
+                    new_line = _SECURITY_CODE.replace(b"// Create the participant", match.group(1).strip() if match.group(1) else b"// Create the participant")
                 
-                content = content.replace(old_line, new_line)
+                # Splice at the match instead of searching the whole content for old_line again
+                content = b"".join((content[:match.start()], new_line, content[match.end():]))
                 modified = True
                 self.stats['participants_secured'] += 1
         
         return content, modified
     
-    def add_encryption_to_writer(self, content: str) -> Tuple[str, bool]:
-        """Adds encryption settings to DataWriter QoS."""
-        modified = False
+    def add_encryption(self, content: bytes, probe: Optional[dict] = None) -> Tuple[bytes, bool]:
+        """Adds encryption settings to DataWriter QoS, or to DataReader QoS when there is no writer."""
+        if probe is None:
+            probe = self._probe_content(content)
         
         # First check existing encryption settings
-        if "rtps.payload_protection" in content:
+        if probe['payload_protection']:
             print("    ⚠️  Encryption settings already exist, skipping...")
             return content, False
-        
-        # Find DataWriterQos creation location
-        writer_pattern = r'(DataWriterQos\s+writer_qos\s*=\s*DATAWRITER_QOS_DEFAULT;)'
-        match = re.search(writer_pattern, content)
-        
-        if match:
-            # Add encryption property
-            encryption_code = f"""
-    // Payload Encryption Configuration
-    writer_qos.properties().properties().emplace_back("{self.encryption_properties['payload_protection']}", "{self.encryption_properties['encrypt_value']}");"""
-            
-            # Add encryption code
-            old_line = match.group(1)
-            new_line = old_line + encryption_code
-            content = content.replace(old_line, new_line)
-            modified = True
-            self.stats['writers_secured'] += 1
-        
-        return content, modified
-    
-    def add_encryption_to_reader(self, content: str) -> Tuple[str, bool]:
-        """Adds encryption settings to DataReader QoS."""
-        modified = False
-        
-        # First check existing encryption settings
-        if "rtps.payload_protection" in content:
-            print("    ⚠️  Encryption settings already exist, skipping...")
+        if not (probe['writer_qos'] or probe['reader_qos']):
             return content, False
         
-        # Find DataReaderQos creation location
-        reader_pattern = r'(DataReaderQos\s+reader_qos\s*=\s*DATAREADER_QOS_DEFAULT;)'
-        match = re.search(reader_pattern, content)
+        # Find DataWriterQos/DataReaderQos creation locations in one pass; a writer takes precedence
+        match = None
+        for decl in _RE_ENDPOINT_QOS.finditer(content):
+            if decl.lastgroup == 'writer':
+                match = decl
+                break
+            if match is None:
+                match = decl
+        if match is None:
+            return content, False
         
-        if match:
-            # Add encryption property
-            encryption_code = f"""
-    // Payload Encryption Configuration
-    reader_qos.properties().properties().emplace_back("{self.encryption_properties['payload_protection']}", "{self.encryption_properties['encrypt_value']}");"""
-            
-            # Add encryption code
-            old_line = match.group(1)
-            new_line = old_line + encryption_code
-            content = content.replace(old_line, new_line)
-            modified = True
+        # Add encryption code right after the matched declaration
+        if match.lastgroup == 'writer':
+            code = self._writer_encryption_code
+            self.stats['writers_secured'] += 1
+        else:
+            code = self._reader_encryption_code
             self.stats['readers_secured'] += 1
-        
-        return content, modified
+        end = match.end()
+        probe['payload_protection'] = True
+        return b"".join((content[:end], code, content[end:])), True
     
     def patch_cpp_file(self, file_path: str) -> bool:
         """Patches a single C++ file with security settings."""
+        return self._patch_cpp_file(file_path)[0]
+    
+    def _patch_cpp_file(self, file_path: str) -> Tuple[bool, bool]:
+        """patch_cpp_file, also reporting whether the file was rewritten: (success, changed)."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Raw bytes: every pattern is ASCII, so no UTF-8 decode/encode is needed
+            path = Path(file_path)
+            content = path.read_bytes()
             
             original_content = content
             modified = False
+            # One scan for every marker the steps below branch on
+            probe = self._probe_content(content)
             
             # DomainParticipant security settings
-            content, participant_modified = self.add_security_to_participant(content)
+            content, participant_modified = self.add_security_to_participant(content, probe)
             if participant_modified:
                 modified = True
             
-            # DataWriter encryption settings
-            content, writer_modified = self.add_encryption_to_writer(content)
-            if writer_modified:
-                modified = True
-            
-            # DataReader encryption settings
-            content, reader_modified = self.add_encryption_to_reader(content)
-            if reader_modified:
+            # DataWriter/DataReader encryption settings (the participant code adds no writer/reader markers)
+            content, encryption_modified = self.add_encryption(content, probe)
+            if encryption_modified:
                 modified = True
             
             # Update file
             if modified:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"✅ Security settings added: {Path(file_path).name}")
-                return True
+                path.write_bytes(content)
+                print(f"✅ Security settings added: {path.name}")
+                return True, True
             else:
-                print(f"⚠️  No changes needed: {Path(file_path).name}")
-                return True
+                print(f"⚠️  No changes needed: {path.name}")
+                return True, False
                 
         except Exception as e:
             error_msg = f"File processing error {file_path}: {str(e)}"
             print(f"❌ {error_msg}")
             self.stats['errors'].append(error_msg)
-            return False
+            return False, False
+    
+    def _patch_cpp_file_captured(self, file_path: str) -> Tuple[bool, bool, dict, List[str], str]:
+        """_patch_cpp_file with its output captured: (success, changed, stat increments, errors, printed text)."""
+        before = {key: self.stats[key] for key in _COUNTED_STATS}
+        errors_before = len(self.stats['errors'])
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            success, changed = self._patch_cpp_file(file_path)
+        # Hand the increments back to the caller and leave self.stats as it was, so in-process
+        # and worker-process runs are merged the same way
+        deltas = {key: self.stats[key] - before[key] for key in _COUNTED_STATS}
+        errors = self.stats['errors'][errors_before:]
+        self.stats.update(before)
+        del self.stats['errors'][errors_before:]
+        return success, changed, deltas, errors, output.getvalue()
+    
+    def _patch_files(self, file_paths: List[str]) -> Iterator[Tuple[bool, bool, dict, List[str], str]]:
+        """Patch files independently, in worker processes when worthwhile; results keep input order."""
+        if len(file_paths) >= 4 and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor() as executor:
+                yield from executor.map(self._patch_cpp_file_captured, file_paths, chunksize=4)
+        else:
+            yield from map(self._patch_cpp_file_captured, file_paths)
+    
+    def _cache_signature(self) -> str:
+        """Hash of the code this patcher inserts; a cache written by a different version is ignored."""
+        code = _SECURITY_CODE + self._writer_encryption_code + self._reader_encryption_code
+        return hashlib.blake2b(code, digest_size=8).hexdigest()
+    
+    def _load_patch_cache(self) -> dict:
+        """Files found already patched by an earlier run, or {} when missing or stale."""
+        try:
+            with open(os.path.join(self.project_root, 'secure_dds', _PATCH_CACHE_NAME), 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('signature') != self._cache_signature():
+                return {}
+            return cache.get('files', {})
+        except Exception:
+            return {}
+    
+    def _save_patch_cache(self, files: dict) -> None:
+        cache_file = os.path.join(self.project_root, 'secure_dds', _PATCH_CACHE_NAME)
+        tmp = cache_file + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'signature': self._cache_signature(), 'files': files}, f)
+            os.replace(tmp, cache_file)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+    
+    @staticmethod
+    def _stat_key(file_path: str) -> Optional[List[int]]:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
     
     def run(self):
         """Run main processing flow."""
@@ -506,14 +614,29 @@ class DDSSecurityPatcher:
         total_files = 0
         successful_files = 0
         
+        # Find C++ files of every folder first, so all files can be patched in parallel
+        folder_files = []
         for folder_path in generated_folders:
+            # One directory listing, publishers first, then subscribers
+            publishers, subscribers = [], []
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith('PublisherApp.cxx'):
+                        publishers.append(Path(entry.path))
+                    elif entry.name.endswith('SubscriberApp.cxx'):
+                        subscribers.append(Path(entry.path))
+            folder_files.append((folder_path, publishers + subscribers))
+        
+        # Files found already patched by an earlier run and not modified since are not read again
+        cache = self._load_patch_cache()
+        stat_keys = {str(f): self._stat_key(str(f)) for _, cpp_files in folder_files for f in cpp_files}
+        cached = {path for path, key in stat_keys.items() if key is not None and cache.get(path) == key}
+        results = self._patch_files([path for path in stat_keys if path not in cached])
+        new_cache = {}
+        
+        for folder_path, cpp_files in folder_files:
             print(f"\n🔍 Processing: {folder_path}")
             
-            # Find C++ files
-            cpp_files = []
-            for pattern in ['*PublisherApp.cxx', '*SubscriberApp.cxx']:
-                cpp_files.extend(Path(folder_path).glob(pattern))
-            
             if not cpp_files:
                 print("   ⚠️  No C++ files found")
                 continue
@@ -522,13 +645,30 @@ class DDSSecurityPatcher:
             for cpp_file in cpp_files:
                 print(f"   - {cpp_file.name}")
             
-            # Process each file
+            # Process each file (output and stats are replayed in file order)
             for cpp_file in cpp_files:
                 total_files += 1
-                if self.patch_cpp_file(str(cpp_file)):
+                path = str(cpp_file)
+                if path in cached:
+                    print(f"⚠️  No changes needed (unchanged since last run): {cpp_file.name}")
+                    new_cache[path] = stat_keys[path]
+                    successful_files += 1
+                    self.stats['files_processed'] += 1
+                    continue
+                success, changed, deltas, errors, output = next(results)
+                sys.stdout.write(output)
+                for key, delta in deltas.items():
+                    self.stats[key] += delta
+                self.stats['errors'].extend(errors)
+                if success:
                     successful_files += 1
+                    # Needed no change in this run: already patched, so later runs can skip it
+                    if not changed and not errors and stat_keys[path] is not None and self._stat_key(path) == stat_keys[path]:
+                        new_cache[path] = stat_keys[path]
                 self.stats['files_processed'] += 1
         
+        self._save_patch_cache(new_cache)
+        
         # Result report
         print("\n" + "=" * 50)
         print("🎉 Security patching completed!")
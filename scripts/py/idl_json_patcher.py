@@ -6,13 +6,343 @@ This script analyzes IDL files and adds JSON file reading capability to C++ Publ
 Revised based on the CoreData example.
 """
 
+import io
 import os
+import enum
 import re
+import sys
 import glob
+import mmap
+import hashlib
+import logging
+import functools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional, Union
+
+log = logging.getLogger(__name__)
+
+# publish() replacement shared by all modules; only the sample field assignments differ
+_PUBLISH_TEMPLATE = '''bool {module_name}PublisherApp::publish()
+{{
+    bool ret = false;
+    // Wait for the data endpoints discovery
+    std::unique_lock<std::mutex> matched_lock(mutex_);
+    cv_.wait(matched_lock, [&]()
+            {{
+                // at least one has been discovered
+                return ((matched_ > 0) || is_stopped());
+            }});
+
+    if (!is_stopped())
+    {{
+        // Get data from JSON
+        if (current_scenario_index_ < json_scenarios_.size())
+        {{
+            {module_name}::{struct_name} sample_;
+            const auto& scenario = json_scenarios_[current_scenario_index_];
+            const auto& location = scenario["location"];
+            const auto& coords = location["coords"];
+            const auto& time_info = location["time_info"];
+{body}
+
+            ret = (RETCODE_OK == writer_->write(&sample_));
+
+            // Move to next scenario
+            current_scenario_index_++;
+            if (current_scenario_index_ >= json_scenarios_.size())
+            {{
+                current_scenario_index_ = 0; // Return to beginning
+            }}
+        }}
+    }}
+    return ret;
+}}'''
+
+# Module specific publish() bodies (sample field assignments and displayed data)
+_PUBLISH_BODIES = {
+    "Intelligence": [
+        '',
+        '            // Set command',
+        '            sample_.command(scenario["command"].get<std::string>());',
+        '',
+        '            // Set target location data',
+        '            auto& target_location = sample_.target_location_data();',
+        '            auto& target_coords = target_location.coords();',
+        '            auto& target_time_info = target_location.time_info();',
+        '            target_coords.latitude(coords["latitude"].get<double>());',
+        '            target_coords.longitude(coords["longitude"].get<double>());',
+        '            target_coords.altitude(coords["altitude"].get<float>());',
+        '',
+        '            // Set time information',
+        '            target_time_info.seconds(time_info["seconds"].get<int32_t>());',
+        '            target_time_info.nano_seconds(time_info["nano_seconds"].get<uint32_t>());',
+        '',
+        '            // Speed and orientation',
+        '            target_location.speed_mps(location["speed_mps"].get<float>());',
+        '            target_location.orientation_degrees(location["orientation_degrees"].get<int16_t>());',
+        '',
+        '            // Displaying sent data',
+        '            std::cout << "Scenario " << scenario["id"].get<int>() << " - " << scenario["description"].get<std::string>() << std::endl;',
+        '            std::cout << "  command: " << sample_.command() << std::endl;',
+        '            std::cout << "  target_location_data.coords.latitude: " << target_coords.latitude() << std::endl;',
+        '            std::cout << "  target_location_data.coords.longitude: " << target_coords.longitude() << std::endl;',
+        '            std::cout << "  target_location_data.coords.altitude: " << target_coords.altitude() << std::endl;',
+        '            std::cout << "  target_location_data.time_info.seconds: " << target_time_info.seconds() << std::endl;',
+        '            std::cout << "  target_location_data.time_info.nano_seconds: " << target_time_info.nano_seconds() << std::endl;',
+        '            std::cout << "  target_location_data.speed_mps: " << target_location.speed_mps() << std::endl;',
+        '            std::cout << "  target_location_data.orientation_degrees: " << target_location.orientation_degrees() << std::endl;',
+    ],
+    "Messaging": [
+        '            const auto& header = scenario["header"];',
+        '            const auto& assignment = scenario["assignment"];',
+        '',
+        '            // Set header information',
+        '            auto& sample_header = sample_.header();',
+        '            sample_header.sender_id(header["sender_id"].get<std::string>());',
+        '            sample_header.send_time().seconds(header["send_time"]["seconds"].get<int32_t>());',
+        '            sample_header.send_time().nano_seconds(header["send_time"]["nano_seconds"].get<uint32_t>());',
+        '',
+        '            // Set receiver ID',
+        '            sample_.receiver_id(scenario["receiver_id"].get<std::string>());',
+        '',
+        '            // Set assignment information',
+        '            auto& sample_assignment = sample_.assignment();',
+        '            auto& target_location = sample_assignment.target_location_data();',
+        '            const auto& assigned_location = assignment["target_location_data"];',
+        '            sample_assignment.command(assignment["command"].get<std::string>());',
+        '            target_location.coords().latitude(assigned_location["coords"]["latitude"].get<double>());',
+        '            target_location.coords().longitude(assigned_location["coords"]["longitude"].get<double>());',
+        '            target_location.coords().altitude(assigned_location["coords"]["altitude"].get<float>());',
+        '            target_location.time_info().seconds(assigned_location["time_info"]["seconds"].get<int32_t>());',
+        '            target_location.time_info().nano_seconds(assigned_location["time_info"]["nano_seconds"].get<uint32_t>());',
+        '            target_location.speed_mps(assigned_location["speed_mps"].get<float>());',
+        '            target_location.orientation_degrees(assigned_location["orientation_degrees"].get<int16_t>());',
+        '',
+        '            // Displaying sent data',
+        '            std::cout << "Scenario " << scenario["id"].get<int>() << " - " << scenario["description"].get<std::string>() << std::endl;',
+        '            std::cout << "  header.sender_id: " << sample_header.sender_id() << std::endl;',
+        '            std::cout << "  receiver_id: " << sample_.receiver_id() << std::endl;',
+        '            std::cout << "  assignment.command: " << sample_assignment.command() << std::endl;',
+    ],
+    "_default": [
+        '',
+        '            // Set coordinates',
+        '            auto& sample_coords = sample_.coords();',
+        '            auto& sample_time_info = sample_.time_info();',
+        '            sample_coords.latitude(coords["latitude"].get<double>());',
+        '            sample_coords.longitude(coords["longitude"].get<double>());',
+        '            sample_coords.altitude(coords["altitude"].get<float>());',
+        '',
+        '            // Set time information',
+        '            sample_time_info.seconds(time_info["seconds"].get<int32_t>());',
+        '            sample_time_info.nano_seconds(time_info["nano_seconds"].get<uint32_t>());',
+        '',
+        '            // Speed and orientation',
+        '            sample_.speed_mps(location["speed_mps"].get<float>());',
+        '            sample_.orientation_degrees(location["orientation_degrees"].get<int16_t>());',
+        '',
+        '            // Displaying sent data',
+        '            std::cout << "Scenario " << scenario["id"].get<int>() << " - " << scenario["description"].get<std::string>() << std::endl;',
+        '            std::cout << "  coords.latitude: " << sample_coords.latitude() << std::endl;',
+        '            std::cout << "  coords.longitude: " << sample_coords.longitude() << std::endl;',
+        '            std::cout << "  coords.altitude: " << sample_coords.altitude() << std::endl;',
+        '            std::cout << "  time_info.seconds: " << sample_time_info.seconds() << std::endl;',
+        '            std::cout << "  time_info.nano_seconds: " << sample_time_info.nano_seconds() << std::endl;',
+        '            std::cout << "  speed_mps: " << sample_.speed_mps() << std::endl;',
+        '            std::cout << "  orientation_degrees: " << sample_.orientation_degrees() << std::endl;',
+    ],
+}
+
+class Cast(enum.Enum):
+    """How a subscriber display field value is printed."""
+    NONE = 'none'
+    INT = 'int'    # enums are printed as their integer value
+    BOOL = 'bool'  # booleans are printed as true/false
+
+# Location fields, shared by Location and every struct embedding one
+LOCATION_FIELDS = (
+    ('coords.latitude', Cast.NONE),
+    ('coords.longitude', Cast.NONE),
+    ('coords.altitude', Cast.NONE),
+    ('time_info.seconds', Cast.NONE),
+    ('time_info.nano_seconds', Cast.NONE),
+    ('speed_mps', Cast.NONE),
+    ('orientation_degrees', Cast.NONE),
+)
+
+def _nested_fields(prefix: str, fields: Tuple[Tuple[str, Cast], ...]) -> Tuple[Tuple[str, Cast], ...]:
+    """Return a sub-schema re-rooted under the given member path."""
+    return tuple((f'{prefix}.{path}', cast) for path, cast in fields)
+
+# Subscriber display schema per complex member type: (field path relative to the member, cast).
+# Every intermediate struct on a path is bound to a local reference once instead of repeating the accessor chain.
+FIELD_SCHEMA = {
+    'Coordinates': (
+        ('latitude', Cast.NONE),
+        ('longitude', Cast.NONE),
+        ('altitude', Cast.NONE),
+    ),
+    'Timestamp': (
+        ('seconds', Cast.NONE),
+        ('nano_seconds', Cast.NONE),
+    ),
+    'Location': LOCATION_FIELDS,
+    'MessageHeader': (
+        ('sender_id', Cast.NONE),
+        ('send_time.seconds', Cast.NONE),
+        ('send_time.nano_seconds', Cast.NONE),
+    ),
+    'TaskAssignment': (
+        ('command', Cast.NONE),
+    ) + _nested_fields('target_location_data', LOCATION_FIELDS),
+    'VehicleStatus': (
+        ('task_status', Cast.INT),
+        ('battery_percentage', Cast.NONE),
+        ('signal_strength_dbm', Cast.NONE),
+        ('system_error', Cast.BOOL),
+    ),
+    'TargetDetection': (
+        ('target_ID', Cast.NONE),
+        ('type', Cast.INT),
+    ) + _nested_fields('location_data', LOCATION_FIELDS) + (
+        ('confidence_level', Cast.NONE),
+        ('description', Cast.NONE),
+        ('raw_data_link', Cast.NONE),
+    ),
+}
+# TaskCommand embeds a MessageHeader and a TaskAssignment
+FIELD_SCHEMA['TaskCommand'] = (
+    _nested_fields('header', FIELD_SCHEMA['MessageHeader']) +
+    (('receiver_id', Cast.NONE),) +
+    _nested_fields('assignment', FIELD_SCHEMA['TaskAssignment'])
+)
+
+# Subscriber display line templates, {i} is the indent and {m} the member name
+REF_TMPL = '{i}const auto& {alias} = {owner}.{field}();'
+LINE_TMPL = '{i}std::cout << "  {m}.{path}: " << {value} << std::endl;'
+
+# Printed value per cast mode, baked into one prebuilt line template each
+_CAST_VALUES = {
+    Cast.NONE: '{owner}.{field}()',
+    Cast.INT: 'static_cast<int>({owner}.{field}())',
+    Cast.BOOL: '({owner}.{field}() ? "true" : "false")',
+}
+LINE_TMPLS = {cast: LINE_TMPL.replace('{value}', value) for cast, value in _CAST_VALUES.items()}
+
+# Display line for basic types and unknown members
+DEFAULT_LINE_TMPL = '{i}std::cout << "  {m}: " << sample_.{m}() << std::endl;'
+
+def _field_owner(member_name: str, parent_path: str) -> str:
+    """Return the local reference holding the struct at parent_path of a member."""
+    if not parent_path:
+        return f'{member_name}_ref'
+    return f'{member_name}_{parent_path.rpartition(".")[2]}'
+
+def _render_member(member_name: str, fields: Tuple[Tuple[str, Cast], ...], indent: str) -> List[str]:
+    """Render the reference and display lines of one complex member from its field schema."""
+    lines = [REF_TMPL.format(i=indent, alias=f'{member_name}_ref', owner='sample_', field=member_name)]
+    bound = set()
+    for path, _ in fields:
+        # Bind every intermediate struct once, in order of first use
+        parts = path.split('.')
+        for depth in range(1, len(parts)):
+            parent_path = '.'.join(parts[:depth])
+            if parent_path in bound:
+                continue
+            bound.add(parent_path)
+            lines.append(REF_TMPL.format(
+                i=indent,
+                alias=_field_owner(member_name, parent_path),
+                owner=_field_owner(member_name, '.'.join(parts[:depth - 1])),
+                field=parts[depth - 1],
+            ))
+    for path, cast in fields:
+        parent_path, _, field = path.rpartition('.')
+        lines.append(LINE_TMPLS[cast].format(
+            i=indent, m=member_name, path=path, owner=_field_owner(member_name, parent_path), field=field,
+        ))
+    return lines
+
+# Display block emitter per complex member type, built once at import: the bound str.format of the
+# pre-joined block, so emitting a member is a single call. {i} is the indent and {m} the member name.
+# Keys are interned like the parsed member types, so the dict lookup resolves on identity.
+EMITTERS = {
+    sys.intern(member_type): "\n".join(_render_member('{m}', fields, '{i}')).format
+    for member_type, fields in FIELD_SCHEMA.items()
+}
+DEFAULT_EMITTER = DEFAULT_LINE_TMPL.format
+
+def _emit_member_block(member_type: str, member_name: str, indent: str) -> str:
+    """Return the display block of one struct member."""
+    emitter = EMITTERS.get(member_type)
+    if emitter is None:
+        # Basic types are printed directly
+        return DEFAULT_EMITTER(i=indent, m=member_name)
+    return emitter(i=indent, m=member_name)
+
+@functools.lru_cache(maxsize=None)
+def _build_publish_function(module_name: str, struct_name: str) -> str:
+    """Return the publish() replacement for a module, built once per (module, struct)."""
+    # Messaging and Intelligence have their own bodies, CoreData style modules use the default one
+    body = "\n".join(_PUBLISH_BODIES.get(module_name, _PUBLISH_BODIES["_default"]))
+    return _PUBLISH_TEMPLATE.format(module_name=module_name, struct_name=struct_name, body=body)
+
+@functools.lru_cache(maxsize=None)
+def _build_load_function(module_name: str, project_root: str) -> str:
+    """Return the loadJsonScenarios() definition for a module, built once per (module, project root)."""
+    return f'''void {module_name}PublisherApp::loadJsonScenarios()
+{{
+    try
+    {{
+        std::ifstream file("{project_root}\\\\scenarios\\\\{module_name}.json");
+        if (!file.is_open())
+        {{
+            std::cerr << "JSON file could not be opened: {project_root}\\\\scenarios\\\\{module_name}.json" << std::endl;
+            return;
+        }}
+
+        nlohmann::json json_data;
+        file >> json_data;
+        file.close();
+
+        json_scenarios_ = json_data["scenarios"];
+        std::cout << "{module_name} JSON file: " << json_scenarios_.size() << " scenarios loaded." << std::endl;
+    }}
+    catch (const std::exception& e)
+    {{
+        std::cerr << "{module_name} JSON file reading error: " << e.what() << std::endl;
+    }}
+}}'''
+
+def _splice(content: str, spans: List[Tuple[int, int, str]]) -> str:
+    """Replace the (start, end) spans of content in one pass and join the segments once."""
+    segments = []
+    last = 0
+    for start, end, replacement in sorted(spans):
+        segments.append(content[last:start])
+        segments.append(replacement)
+        last = end
+    segments.append(content[last:])
+    return "".join(segments)
 
 class IDLJSONPatcher:
+    # IDL parsing patterns, applied once per struct
+    _STRUCT_RE = re.compile(r'struct\s+(\w+)\s*\{([^}]+)\}', re.DOTALL)
+    _LINE_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+    _MEMBER_RE = re.compile(r'(\w+(?:\s+\w+)*)\s+(\w+);')
+
+    # Comment stamped into the Subscriber display block, followed by the fingerprint of its members
+    _FINGERPRINT_PREFIX = "// patcher-fp: "
+
+    # Subscriber display block opening lines and leftover cout lines, at both insertion indents
+    _DISPLAY_MARKERS = frozenset(f"{indent}// Displaying received data\n" for indent in (" " * 12, " " * 8))
+    _LEFTOVER_COUT_PREFIXES = tuple(f'{indent}std::cout << "  ' for indent in (" " * 12, " " * 8))
+
+    # Subscriber anchor: the sample receiving loop the data display is inserted into
+    _WHILE_TAKE_SAMPLE_RE = re.compile(r'while \(\(!is_stopped\(\)\) && \(RETCODE_OK == reader->take_next_sample\(&sample_, &info\)\)\)\s*\{')
+
     def __init__(self):
         """Initialize IDL JSON Patcher class."""
         # Dynamically find project root directory
@@ -38,6 +368,9 @@ class IDLJSONPatcher:
         # Dynamically find project root directory
         self.project_root = self._detect_project_root()
         
+        # *.idl directory entries per scanned directory
+        self._idl_entries: Dict[str, List[os.DirEntry]] = {}
+        
         # Special coordinate and speed values
         self.special_values = {
             'lat': '41.0082',
@@ -71,14 +404,58 @@ class IDLJSONPatcher:
             'orientation_degrees': '135'  # Orientation in degrees
         }
 
+    def __getstate__(self):
+        """Pickle state for worker processes; DirEntry objects of the scan cache cannot be pickled."""
+        state = self.__dict__.copy()
+        state['_idl_entries'] = {}
+        return state
+
+    def _read_file(self, file_path: str) -> str:
+        """Read a file as UTF-8 with one read_bytes and decode pass, normalizing newlines like text mode."""
+        content = Path(file_path).read_bytes().decode('utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def _write_file(self, file_path: str, content: Union[str, bytes, memoryview]) -> None:
+        """Write content as UTF-8 with a single os.write call instead of the text IO layer."""
+        data = memoryview(content.encode('utf-8') if isinstance(content, str) else content)
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            # os.write may write less than requested, continue with the remainder
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+    def _write_segments(self, file_path: str, segments: Iterable[str]) -> None:
+        """Stream text segments as UTF-8 through one buffered writer instead of joining them first."""
+        with open(file_path, 'wb', buffering=1 << 20) as f:
+            f.writelines(segment.encode('utf-8') for segment in segments)
+
+    def _scan_idl_entries(self, idl_dir: str) -> List[os.DirEntry]:
+        """Return the *.idl entries of a directory, scanned once with os.scandir and cached."""
+        key = os.path.abspath(idl_dir)
+        entries = self._idl_entries.get(key)
+        if entries is None:
+            try:
+                with os.scandir(idl_dir) as it:
+                    entries = [entry for entry in it if entry.name.endswith('.idl') and entry.is_file()]
+            except OSError:
+                entries = []
+            self._idl_entries[key] = entries
+        return entries
+
+    def _splice_file(self, file_path: str, offset: int, segments: Iterable[str]) -> None:
+        """Rewrite a file from a byte offset on with the given segments, leaving the bytes before it untouched."""
+        with open(file_path, 'r+b', buffering=1 << 20) as f:
+            f.seek(offset)
+            f.writelines(segment.encode('utf-8') for segment in segments)
+            f.truncate()
+
     def find_idl_files(self, root_dir: str = "IDL") -> List[str]:
         """Find all *.idl files in the IDL directory."""
-        idl_files = []
-        for root, dirs, files in os.walk(root_dir):
-            for file in files:
-                if file.endswith('.idl'):
-                    idl_files.append(os.path.join(root, file))
-        return idl_files
+        return [os.path.join(root_dir, entry.name) for entry in self._scan_idl_entries(root_dir)]
 
     def find_target_folder(self, idl_file: str) -> Optional[str]:
         """Find target folder for IDL file (with _idl_generated suffix)."""
@@ -104,15 +481,13 @@ class IDLJSONPatcher:
         structs = {}
         
         try:
-            with open(idl_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_file(idl_file)
         except Exception as e:
             print(f"❌ IDL file could not be read: {idl_file} - {e}")
             return structs
 
         # Find structs
-        struct_pattern = r'struct\s+(\w+)\s*\{([^}]+)\}'
-        matches = re.finditer(struct_pattern, content, re.DOTALL)
+        matches = self._STRUCT_RE.finditer(content)
         
         for match in matches:
             struct_name = match.group(1)
@@ -121,14 +496,14 @@ class IDLJSONPatcher:
             # Find struct members
             members = []
             # Remove comment lines
-            struct_body = re.sub(r'//.*$', '', struct_body, flags=re.MULTILINE)
+            struct_body = self._LINE_COMMENT_RE.sub('', struct_body)
             
             # Find member definitions
-            member_pattern = r'(\w+(?:\s+\w+)*)\s+(\w+);'
-            member_matches = re.finditer(member_pattern, struct_body)
+            member_matches = self._MEMBER_RE.finditer(struct_body)
             
             for member_match in member_matches:
-                member_type = member_match.group(1).strip()
+                # Interned so EMITTERS lookups match on identity
+                member_type = sys.intern(member_match.group(1).strip())
                 member_name = member_match.group(2).strip()
                 members.append((member_type, member_name))
             
@@ -234,8 +609,7 @@ class IDLJSONPatcher:
     def patch_constructor(self, header_file: str, struct_name: str, members: List[Tuple[str, str]], module_name: str = "") -> bool:
         """Patch constructor in C++ header file."""
         try:
-            with open(header_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_file(header_file)
         except Exception as e:
             print(f"❌ Header file could not be read: {header_file} - {e}")
             return False
@@ -273,8 +647,7 @@ class IDLJSONPatcher:
         
         # Update file
         try:
-            with open(header_file, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
+            self._write_file(header_file, updated_content)
             return True
         except Exception as e:
             print(f"❌ Header file could not be written: {header_file} - {e}")
@@ -303,8 +676,7 @@ class IDLJSONPatcher:
         # Find module name
         module_name = ""
         try:
-            with open(idl_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_file(idl_file)
             module_match = re.search(r'module\s+(\w+)', content)
             if module_match:
                 module_name = module_match.group(1)
@@ -350,53 +722,59 @@ class IDLJSONPatcher:
             
             main_members = structs[main_struct]
             
+            # (label, target name, patch function, arguments) for every file of this module
+            patch_jobs = []
+            
             # Patch Publisher header
             publisher_header_file = os.path.join(target_folder, f"{module_name}PublisherApp.hpp")
             if os.path.exists(publisher_header_file):
-                print(f"  🔧 Patching Publisher header: {os.path.basename(publisher_header_file)}")
-                if self.patch_publisher_header(publisher_header_file, module_name):
-                    print(f"     ✅ Publisher header successfully patched")
-                else:
-                    print(f"     ❌ Publisher header could not be patched")
+                patch_jobs.append((f"Patching Publisher header: {os.path.basename(publisher_header_file)}", "Publisher header",
+                                   self.patch_publisher_header, (publisher_header_file, module_name)))
             
             # Patch Publisher
             if 'publisher' in app_files:
-                print(f"  🔧 Patching Publisher: {os.path.basename(app_files['publisher'])}")
-                if self.patch_publisher_app(app_files['publisher'], main_struct, main_members, module_name):
-                    print(f"     ✅ Publisher successfully patched")
-                else:
-                    print(f"     ❌ Publisher could not be patched")
+                patch_jobs.append((f"Patching Publisher: {os.path.basename(app_files['publisher'])}", "Publisher",
+                                   self.patch_publisher_app, (app_files['publisher'], main_struct, main_members, module_name)))
             
             # CMakeLists.txt'i patch et
             cmake_file = os.path.join(target_folder, "CMakeLists.txt")
             if os.path.exists(cmake_file):
-                print(f"  🔧 Patching CMakeLists.txt")
-                if self.patch_cmake_lists(cmake_file):
-                    print(f"     ✅ CMakeLists.txt successfully patched")
-                else:
-                    print(f"     ❌ CMakeLists.txt could not be patched")
+                patch_jobs.append(("Patching CMakeLists.txt", "CMakeLists.txt", self.patch_cmake_lists, (cmake_file,)))
             
             # Patch Subscriber
             if 'subscriber' in app_files:
-                print(f"  🔧 Patching Subscriber: {os.path.basename(app_files['subscriber'])}")
-                if self.patch_subscriber_app(app_files['subscriber'], main_struct, main_members, module_name):
-                    print(f"     ✅ Subscriber successfully patched")
+                patch_jobs.append((f"Patching Subscriber: {os.path.basename(app_files['subscriber'])}", "Subscriber",
+                                   self.patch_subscriber_app, (app_files['subscriber'], main_struct, main_members, module_name)))
+            
+            # Run in order, each under its label: the patch functions print their own progress
+            # (IDL files themselves are already processed in parallel by run())
+            for label, target, func, args in patch_jobs:
+                print(f"  🔧 {label}")
+                if func(*args):
+                    print(f"     ✅ {target} successfully patched")
                 else:
-                    print(f"     ❌ Subscriber could not be patched")
+                    print(f"     ❌ {target} could not be patched")
         
         print(f"\n📊 Summary: {success_count}/{total_count} structs successfully processed")
         return success_count == total_count
 
+    def _process_idl_file_captured(self, idl_file: str) -> Tuple[bool, str]:
+        """Process a single IDL file and return its result together with everything it printed."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            success = self.process_idl_file(idl_file)
+        return success, output.getvalue()
+
     def patch_all_constructors(self, header_file: str, structs: Dict[str, List[Tuple[str, str]]], module_name: str = "") -> bool:
         """Patch constructors of all structs."""
         try:
-            with open(header_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_file(header_file)
         except Exception as e:
             print(f"❌ Header file could not be read: {header_file} - {e}")
             return False
 
-        updated_content = content
+        # Constructor replacements as (start, end, text), spliced into the header once
+        spans = []
         success_count = 0
         
         for struct_name, members in structs.items():
@@ -404,7 +782,7 @@ class IDLJSONPatcher:
             
             # Find constructor
             constructor_pattern = rf'eProsima_user_DllExport\s+{re.escape(struct_name)}\(\)\s*\{{([^}}]*)\}}'
-            match = re.search(constructor_pattern, updated_content, re.DOTALL)
+            match = re.search(constructor_pattern, content, re.DOTALL)
             
             if not match:
                 print(f"     ⚠️  {struct_name} constructor not found")
@@ -425,17 +803,15 @@ class IDLJSONPatcher:
                 new_constructor_body += f"        m_{member_name} = {dummy_value};\n"
 
             # Update constructor
-            old_constructor = match.group(0)
             new_constructor = f"eProsima_user_DllExport {struct_name}()\n    {{\n{new_constructor_body}\n    }}"
             
-            updated_content = updated_content.replace(old_constructor, new_constructor)
+            spans.append((match.start(), match.end(), new_constructor))
             success_count += 1
             print(f"     ✅ {struct_name} constructor patched")
 
         # Update file
         try:
-            with open(header_file, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
+            self._write_file(header_file, _splice(content, spans))
             return True
         except Exception as e:
             print(f"❌ Header file could not be written: {header_file} - {e}")
@@ -444,13 +820,13 @@ class IDLJSONPatcher:
     def force_patch_all_constructors(self, header_file: str, structs: Dict[str, List[Tuple[str, str]]], module_name: str = "") -> bool:
         """Force patch constructors of all structs (clears existing content)."""
         try:
-            with open(header_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_file(header_file)
         except Exception as e:
             print(f"❌ Header file could not be read: {header_file} - {e}")
             return False
 
-        updated_content = content
+        # Constructor replacements as (start, end, text), spliced into the header once
+        spans = []
         success_count = 0
         
         for struct_name, members in structs.items():
@@ -458,7 +834,7 @@ class IDLJSONPatcher:
             
             # Find constructor
             constructor_pattern = rf'eProsima_user_DllExport\s+{re.escape(struct_name)}\(\)\s*\{{([^}}]*)\}}'
-            match = re.search(constructor_pattern, updated_content, re.DOTALL)
+            match = re.search(constructor_pattern, content, re.DOTALL)
             
             if not match:
                 print(f"     ⚠️  {struct_name} constructor not found")
@@ -471,17 +847,15 @@ class IDLJSONPatcher:
                 new_constructor_body += f"        m_{member_name} = {dummy_value};\n"
 
             # Update constructor
-            old_constructor = match.group(0)
             new_constructor = f"eProsima_user_DllExport {struct_name}()\n    {{\n{new_constructor_body}\n    }}"
             
-            updated_content = updated_content.replace(old_constructor, new_constructor)
+            spans.append((match.start(), match.end(), new_constructor))
             success_count += 1
             print(f"     ✅ {struct_name} constructor force patched")
 
         # Update file
         try:
-            with open(header_file, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
+            self._write_file(header_file, _splice(content, spans))
             return True
         except Exception as e:
             print(f"❌ Header file could not be written: {header_file} - {e}")
@@ -490,8 +864,7 @@ class IDLJSONPatcher:
     def patch_publisher_header(self, header_file: str, module_name: str = "") -> bool:
         """Add required includes and member variables for JSON reading to Publisher header file."""
         try:
-            with open(header_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_file(header_file)
         except Exception as e:
             print(f"❌ Header file could not be read: {header_file} - {e}")
             return False
@@ -601,8 +974,7 @@ class IDLJSONPatcher:
 
         # Update file
         try:
-            with open(header_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_file(header_file, content)
             return True
         except Exception as e:
             print(f"❌ Header file could not be written: {header_file} - {e}")
@@ -611,12 +983,15 @@ class IDLJSONPatcher:
     def patch_publisher_app(self, publisher_file: str, struct_name: str, members: List[Tuple[str, str]], module_name: str = "") -> bool:
         """Patch Publisher application - adds JSON reading capability."""
         try:
-            with open(publisher_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_file(publisher_file)
         except Exception as e:
             print(f"❌ Publisher file could not be read: {publisher_file} - {e}")
             return False
 
+        # Already patched by a previous run, nothing to do
+        if f'void {module_name}PublisherApp::loadJsonScenarios()' in content:
+            return True
+
         # Clean duplicate loadJsonScenarios functions
         load_function_pattern = rf'void {module_name}PublisherApp::loadJsonScenarios\(\)\s*\{{[^}}]*\}}'
         content = re.sub(load_function_pattern, '', content, flags=re.DOTALL)
@@ -640,233 +1015,30 @@ class IDLJSONPatcher:
                 init_line = '        current_scenario_index_ = 0;\n        loadJsonScenarios();'
                 new_constructor_body = constructor_body.rstrip() + '\n' + init_line + '\n    }'
                 content = content.replace(constructor_match.group(0), 
-                                        constructor_match.group(0).replace(constructor_body, new_constructor_body))
+                                        constructor_match.group(0).replace(constructor_body, new_constructor_body, 1), 1)
 
         # Add loadJsonScenarios function
-        load_function = f'''void {module_name}PublisherApp::loadJsonScenarios()
-{{
-    try
-    {{
-        std::ifstream file("{self.project_root}\\\\scenarios\\\\{module_name}.json");
-        if (!file.is_open())
-        {{
-            std::cerr << "JSON file could not be opened: {self.project_root}\\\\scenarios\\\\{module_name}.json" << std::endl;
-            return;
-        }}
-
-        nlohmann::json json_data;
-        file >> json_data;
-        file.close();
-
-        json_scenarios_ = json_data["scenarios"];
-        std::cout << "{module_name} JSON file: " << json_scenarios_.size() << " scenarios loaded." << std::endl;
-    }}
-    catch (const std::exception& e)
-    {{
-        std::cerr << "{module_name} JSON file reading error: " << e.what() << std::endl;
-    }}
-}}'''
-
-        # Fonksiyonu dosya sonuna ekle
-        content = content.rstrip() + '\n\n' + load_function
+        load_function = _build_load_function(module_name, self.project_root)
 
         # Completely replace publish() function
         publish_pattern = r'bool\s+\w+PublisherApp::publish\(\)\s*\{{[^}}]*\}}'
         publish_match = re.search(publish_pattern, content, re.DOTALL)
         
         if publish_match:
-            # Special JSON reading code for Intelligence
-            if module_name == "Intelligence":
-                new_publish_function = f'''bool {module_name}PublisherApp::publish()
-{{
-    bool ret = false;
-    // Wait for the data endpoints discovery
-    std::unique_lock<std::mutex> matched_lock(mutex_);
-    cv_.wait(matched_lock, [&]()
-            {{
-                // at least one has been discovered
-                return ((matched_ > 0) || is_stopped());
-            }});
-
-    if (!is_stopped())
-    {{
-        // Get data from JSON
-        if (current_scenario_index_ < json_scenarios_.size())
-        {{
-            {module_name}::{struct_name} sample_;
-            const auto& scenario = json_scenarios_[current_scenario_index_];
-            const auto& location = scenario["location"];
-            const auto& coords = location["coords"];
-            const auto& time_info = location["time_info"];
-
-            // Set command
-            sample_.command(scenario["command"].get<std::string>());
-
-            // Set target location data
-            sample_.target_location_data().coords().latitude(coords["latitude"].get<double>());
-            sample_.target_location_data().coords().longitude(coords["longitude"].get<double>());
-            sample_.target_location_data().coords().altitude(coords["altitude"].get<float>());
-
-            // Set time information
-            sample_.target_location_data().time_info().seconds(time_info["seconds"].get<int32_t>());
-            sample_.target_location_data().time_info().nano_seconds(time_info["nano_seconds"].get<uint32_t>());
-
-            // Speed and orientation
-            sample_.target_location_data().speed_mps(location["speed_mps"].get<float>());
-            sample_.target_location_data().orientation_degrees(location["orientation_degrees"].get<int16_t>());
-
-            // Displaying sent data
-            std::cout << "Scenario " << scenario["id"].get<int>() << " - " << scenario["description"].get<std::string>() << std::endl;
-            std::cout << "  command: " << sample_.command() << std::endl;
-            std::cout << "  target_location_data.coords.latitude: " << sample_.target_location_data().coords().latitude() << std::endl;
-            std::cout << "  target_location_data.coords.longitude: " << sample_.target_location_data().coords().longitude() << std::endl;
-            std::cout << "  target_location_data.coords.altitude: " << sample_.target_location_data().coords().altitude() << std::endl;
-            std::cout << "  target_location_data.time_info.seconds: " << sample_.target_location_data().time_info().seconds() << std::endl;
-            std::cout << "  target_location_data.time_info.nano_seconds: " << sample_.target_location_data().time_info().nano_seconds() << std::endl;
-            std::cout << "  target_location_data.speed_mps: " << sample_.target_location_data().speed_mps() << std::endl;
-            std::cout << "  target_location_data.orientation_degrees: " << sample_.target_location_data().orientation_degrees() << std::endl;
-
-            ret = (RETCODE_OK == writer_->write(&sample_));
-
-            // Move to next scenario
-            current_scenario_index_++;
-            if (current_scenario_index_ >= json_scenarios_.size())
-            {{
-                current_scenario_index_ = 0; // Return to beginning
-            }}
-        }}
-    }}
-    return ret;
-}}'''
-            elif module_name == "Messaging":
-                # Special JSON reading code for Messaging
-                new_publish_function = f'''bool {module_name}PublisherApp::publish()
-{{
-    bool ret = false;
-    // Wait for the data endpoints discovery
-    std::unique_lock<std::mutex> matched_lock(mutex_);
-    cv_.wait(matched_lock, [&]()
-            {{
-                // at least one has been discovered
-                return ((matched_ > 0) || is_stopped());
-            }});
-
-    if (!is_stopped())
-    {{
-        // Get data from JSON
-        if (current_scenario_index_ < json_scenarios_.size())
-        {{
-            {module_name}::{struct_name} sample_;
-            const auto& scenario = json_scenarios_[current_scenario_index_];
-            const auto& location = scenario["location"];
-            const auto& coords = location["coords"];
-            const auto& time_info = location["time_info"];
-            const auto& header = scenario["header"];
-            const auto& assignment = scenario["assignment"];
-
-            // Set header information
-            sample_.header().sender_id(header["sender_id"].get<std::string>());
-            sample_.header().send_time().seconds(header["send_time"]["seconds"].get<int32_t>());
-            sample_.header().send_time().nano_seconds(header["send_time"]["nano_seconds"].get<uint32_t>());
-
-            // Set receiver ID
-            sample_.receiver_id(scenario["receiver_id"].get<std::string>());
-
-            // Set assignment information
-            sample_.assignment().command(assignment["command"].get<std::string>());
-            sample_.assignment().target_location_data().coords().latitude(assignment["target_location_data"]["coords"]["latitude"].get<double>());
-            sample_.assignment().target_location_data().coords().longitude(assignment["target_location_data"]["coords"]["longitude"].get<double>());
-            sample_.assignment().target_location_data().coords().altitude(assignment["target_location_data"]["coords"]["altitude"].get<float>());
-            sample_.assignment().target_location_data().time_info().seconds(assignment["target_location_data"]["time_info"]["seconds"].get<int32_t>());
-            sample_.assignment().target_location_data().time_info().nano_seconds(assignment["target_location_data"]["time_info"]["nano_seconds"].get<uint32_t>());
-            sample_.assignment().target_location_data().speed_mps(assignment["target_location_data"]["speed_mps"].get<float>());
-            sample_.assignment().target_location_data().orientation_degrees(assignment["target_location_data"]["orientation_degrees"].get<int16_t>());
-
-            // Displaying sent data
-            std::cout << "Scenario " << scenario["id"].get<int>() << " - " << scenario["description"].get<std::string>() << std::endl;
-            std::cout << "  header.sender_id: " << sample_.header().sender_id() << std::endl;
-            std::cout << "  receiver_id: " << sample_.receiver_id() << std::endl;
-            std::cout << "  assignment.command: " << sample_.assignment().command() << std::endl;
-
-            ret = (RETCODE_OK == writer_->write(&sample_));
-
-            // Move to next scenario
-            current_scenario_index_++;
-            if (current_scenario_index_ >= json_scenarios_.size())
-            {{
-                current_scenario_index_ = 0; // Return to beginning
-            }}
-        }}
-    }}
-    return ret;
-}}'''
-            else:
-                # Standard JSON reading code for CoreData
-                new_publish_function = f'''bool {module_name}PublisherApp::publish()
-{{
-    bool ret = false;
-    // Wait for the data endpoints discovery
-    std::unique_lock<std::mutex> matched_lock(mutex_);
-    cv_.wait(matched_lock, [&]()
-            {{
-                // at least one has been discovered
-                return ((matched_ > 0) || is_stopped());
-            }});
-
-    if (!is_stopped())
-    {{
-        // Get data from JSON
-        if (current_scenario_index_ < json_scenarios_.size())
-        {{
-            {module_name}::{struct_name} sample_;
-            const auto& scenario = json_scenarios_[current_scenario_index_];
-            const auto& location = scenario["location"];
-            const auto& coords = location["coords"];
-            const auto& time_info = location["time_info"];
-
-            // Set coordinates
-            sample_.coords().latitude(coords["latitude"].get<double>());
-            sample_.coords().longitude(coords["longitude"].get<double>());
-            sample_.coords().altitude(coords["altitude"].get<float>());
-
-            // Set time information
-            sample_.time_info().seconds(time_info["seconds"].get<int32_t>());
-            sample_.time_info().nano_seconds(time_info["nano_seconds"].get<uint32_t>());
-
-            // Speed and orientation
-            sample_.speed_mps(location["speed_mps"].get<float>());
-            sample_.orientation_degrees(location["orientation_degrees"].get<int16_t>());
-
-            // Displaying sent data
-            std::cout << "Scenario " << scenario["id"].get<int>() << " - " << scenario["description"].get<std::string>() << std::endl;
-            std::cout << "  coords.latitude: " << sample_.coords().latitude() << std::endl;
-            std::cout << "  coords.longitude: " << sample_.coords().longitude() << std::endl;
-            std::cout << "  coords.altitude: " << sample_.coords().altitude() << std::endl;
-            std::cout << "  time_info.seconds: " << sample_.time_info().seconds() << std::endl;
-            std::cout << "  time_info.nano_seconds: " << sample_.time_info().nano_seconds() << std::endl;
-            std::cout << "  speed_mps: " << sample_.speed_mps() << std::endl;
-            std::cout << "  orientation_degrees: " << sample_.orientation_degrees() << std::endl;
-
-            ret = (RETCODE_OK == writer_->write(&sample_));
-
-            // Move to next scenario
-            current_scenario_index_++;
-            if (current_scenario_index_ >= json_scenarios_.size())
-            {{
-                current_scenario_index_ = 0; // Return to beginning
-            }}
-        }}
-    }}
-    return ret;
-}}'''
-            
-            # Replace old publish function with new one
-            content = content.replace(publish_match.group(0), new_publish_function)
+            new_publish_function = _build_publish_function(module_name, struct_name)
         
-        # Update file
+        # Update file - emitted in order into one buffer: new publish() in place, loadJsonScenarios at the end
+        out = io.BytesIO()
+        if publish_match:
+            out.write(content[:publish_match.start()].encode('utf-8'))
+            out.write(new_publish_function.encode('utf-8'))
+            out.write(content[publish_match.end():].rstrip().encode('utf-8'))
+        else:
+            out.write(content.rstrip().encode('utf-8'))
+        out.write(b'\n\n')
+        out.write(load_function.encode('utf-8'))
         try:
-            with open(publisher_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_file(publisher_file, out.getbuffer())
             return True
         except Exception as e:
             print(f"❌ Publisher file could not be written: {publisher_file} - {e}")
@@ -875,8 +1047,16 @@ class IDLJSONPatcher:
     def patch_cmake_lists(self, cmake_file: str) -> bool:
         """Add nlohmann_json dependency to CMakeLists.txt file."""
         try:
-            with open(cmake_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(cmake_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    content = ''
+                else:
+                    # Check the raw bytes first, already patched files are neither decoded nor rewritten
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if (mm.find(b'find_package(nlohmann_json REQUIRED)') != -1 and
+                                mm.find(b'nlohmann_json::nlohmann_json') != -1):
+                            return True
+                        content = mm[:].decode('utf-8').replace('\r\n', '\n')
         except Exception as e:
             print(f"❌ CMakeLists.txt file could not be read: {cmake_file} - {e}")
             return False
@@ -884,11 +1064,11 @@ class IDLJSONPatcher:
         # Add nlohmann_json find_package
         if 'find_package(nlohmann_json REQUIRED)' not in content:
             # Find and add find_package lines
-            find_package_pattern = r'(find_package\([^)]+\))'
-            find_package_match = re.search(find_package_pattern, content)
+            find_package_start = content.find('find_package(')
+            find_package_end = content.find(')', find_package_start) if find_package_start != -1 else -1
             
-            if find_package_match:
-                insert_pos = find_package_match.end()
+            if find_package_end != -1:
+                insert_pos = find_package_end + 1
                 content = content[:insert_pos] + '\nfind_package(nlohmann_json REQUIRED)' + content[insert_pos:]
             else:
                 # Add to file beginning
@@ -896,206 +1076,124 @@ class IDLJSONPatcher:
 
         # Add nlohmann_json to target_link_libraries
         if 'nlohmann_json::nlohmann_json' not in content:
-            target_link_pattern = r'(target_link_libraries\([^)]+\))'
-            target_link_match = re.search(target_link_pattern, content)
+            target_link_start = content.find('target_link_libraries(')
+            target_link_end = content.find(')', target_link_start) if target_link_start != -1 else -1
             
-            if target_link_match:
-                old_target_link = target_link_match.group(1)
-                new_target_link = old_target_link.rstrip(')') + '\n            nlohmann_json::nlohmann_json\n            )'
-                content = content.replace(old_target_link, new_target_link)
+            if target_link_end != -1:
+                # Splice the dependency in before the closing parenthesis
+                content = (content[:target_link_end] + '\n            nlohmann_json::nlohmann_json\n            ' +
+                           content[target_link_end:])
 
         # Update file
         try:
-            with open(cmake_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_file(cmake_file, content)
             return True
         except Exception as e:
             print(f"❌ CMakeLists.txt file could not be written: {cmake_file} - {e}")
             return False
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _sample_decl_re(module_name: str, struct_name: str) -> re.Pattern:
+        """Return the compiled `Module::Struct sample_;` declaration pattern, compiled once per struct."""
+        return re.compile(rf'{module_name}::{struct_name}\s+sample_;')
+
+    def _display_fingerprint(self, members: List[Tuple[str, str]]) -> str:
+        """Return a short hash of the members and their display schemas, stamped into the display block."""
+        key = repr([(member_type, member_name, FIELD_SCHEMA.get(member_type)) for member_type, member_name in members])
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+    def _build_data_display(self, members: List[Tuple[str, str]], indent: str, fingerprint: str) -> str:
+        """Build the Subscriber data display block for the given struct members."""
+        buf = io.StringIO()
+        write = buf.write
+        write(f"{indent}// Displaying received data\n")
+        write(f"{indent}{self._FINGERPRINT_PREFIX}{fingerprint}")
+        for member_type, member_name in members:
+            write("\n")
+            write(_emit_member_block(member_type, member_name, indent))
+        return buf.getvalue()
+
+    def _clean_subscriber_content(self, content: str) -> str:
+        """Remove old data display blocks, leftover cout lines and repeated empty lines."""
+        out_lines = []
+        blank_lines = []
+        # Indent of the display block being removed, None outside one
+        block_indent = None
+        for line in content.splitlines(keepends=True):
+            # Blocks sit inside the receive loop (12 spaces) or, as fallback, after the sample (8)
+            if line in self._DISPLAY_MARKERS:
+                block_indent = line[:line.index('/')]
+                continue
+            if block_indent is not None:
+                # Display block: fingerprint, cout lines and the local references they use
+                if (line.startswith((f'{block_indent}std::cout << "', f'{block_indent}const auto& ')) and
+                        line.endswith(';\n') and line.find(';') == len(line) - 2):
+                    continue
+                if line.startswith(f'{block_indent}{self._FINGERPRINT_PREFIX}'):
+                    continue
+                block_indent = None
+            if line.startswith(self._LEFTOVER_COUT_PREFIXES) and '<< sample_.' in line and line.endswith(';\n'):
+                continue
+            if not line.strip():
+                blank_lines.append(line)
+                continue
+            # Runs of empty lines collapse into a single one
+            if blank_lines:
+                out_lines.append('\n' if len(blank_lines) > 1 else blank_lines[0])
+                blank_lines = []
+            out_lines.append(line)
+        if blank_lines:
+            out_lines.append('\n' if len(blank_lines) > 1 else blank_lines[0])
+        return ''.join(out_lines)
+
     def patch_subscriber_app(self, subscriber_file: str, struct_name: str, members: List[Tuple[str, str]], module_name: str = "") -> bool:
         """Patch Subscriber application - displays received data."""
         try:
-            with open(subscriber_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_file(subscriber_file)
         except Exception as e:
             print(f"❌ Subscriber file could not be read: {subscriber_file} - {e}")
             return False
 
-        # Clean old data display codes - stronger regex
-        old_display_pattern = r'            // Displaying received data\n(            std::cout << "[^"]*" << [^;]+;\n)*'
-        content = re.sub(old_display_pattern, '', content)
-        
-        # Clean duplicate codes
-        duplicate_pattern = r'            std::cout << "  [^"]*": " << sample_\.[^;]+;\n'
-        content = re.sub(duplicate_pattern, '', content)
-        
-        # Clean all old cout lines
-        old_cout_pattern = r'            std::cout << "  [^"]*" << sample_\.[^;]+;\n'
-        content = re.sub(old_cout_pattern, '', content)
-        
-        # Clean empty lines
-        content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+        # Already patched by a previous run if the display block carries the same fingerprint
+        fingerprint = self._display_fingerprint(members)
+        if f"{self._FINGERPRINT_PREFIX}{fingerprint}\n" in content:
+            return True
+
+        # Clean old data display blocks, leftover cout lines and empty lines in one pass
+        original = content
+        content = self._clean_subscriber_content(content)
         
         # Find sample receiving location in Subscriber
-        sample_pattern = rf'{module_name}::{struct_name}\s+sample_;'
-        match = re.search(sample_pattern, content)
+        match = self._sample_decl_re(module_name, struct_name).search(content)
         
         if not match:
             print(f"     ⚠️  {struct_name} sample not found in Subscriber")
             return False
 
         # Add data display inside while loop
-        while_pattern = r'while \(\(!is_stopped\(\)\) && \(RETCODE_OK == reader->take_next_sample\(&sample_, &info\)\)\)\s*\{'
-        while_match = re.search(while_pattern, content)
+        while_match = self._WHILE_TAKE_SAMPLE_RE.search(content)
         
         if while_match:
             # Add data display inside while loop
-            while_start = while_match.group(0)
-            data_display = []
-            data_display.append(f"            // Displaying received data")
-            for member_type, member_name in members:
-                # Detailed display for complex types
-                if member_type == 'Coordinates':
-                    data_display.append(f"            std::cout << \"  {member_name}.latitude: \" << sample_.{member_name}().latitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.longitude: \" << sample_.{member_name}().longitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.altitude: \" << sample_.{member_name}().altitude() << std::endl;")
-                elif member_type == 'Timestamp':
-                    data_display.append(f"            std::cout << \"  {member_name}.seconds: \" << sample_.{member_name}().seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.nano_seconds: \" << sample_.{member_name}().nano_seconds() << std::endl;")
-                elif member_type == 'Location':
-                    data_display.append(f"            std::cout << \"  {member_name}.coords.latitude: \" << sample_.{member_name}().coords().latitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.coords.longitude: \" << sample_.{member_name}().coords().longitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.coords.altitude: \" << sample_.{member_name}().coords().altitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.time_info.seconds: \" << sample_.{member_name}().time_info().seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.time_info.nano_seconds: \" << sample_.{member_name}().time_info().nano_seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.speed_mps: \" << sample_.{member_name}().speed_mps() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.orientation_degrees: \" << sample_.{member_name}().orientation_degrees() << std::endl;")
-                elif member_type == 'MessageHeader':
-                    data_display.append(f"            std::cout << \"  {member_name}.sender_id: \" << sample_.{member_name}().sender_id() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.send_time.seconds: \" << sample_.{member_name}().send_time().seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.send_time.nano_seconds: \" << sample_.{member_name}().send_time().nano_seconds() << std::endl;")
-                elif member_type == 'TaskAssignment':
-                    data_display.append(f"            std::cout << \"  {member_name}.command: \" << sample_.{member_name}().command() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.target_location_data.coords.latitude: \" << sample_.{member_name}().target_location_data().coords().latitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.target_location_data.coords.longitude: \" << sample_.{member_name}().target_location_data().coords().longitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.target_location_data.coords.altitude: \" << sample_.{member_name}().target_location_data().coords().altitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.target_location_data.time_info.seconds: \" << sample_.{member_name}().target_location_data().time_info().seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.target_location_data.time_info.nano_seconds: \" << sample_.{member_name}().target_location_data().time_info().nano_seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.target_location_data.speed_mps: \" << sample_.{member_name}().target_location_data().speed_mps() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.target_location_data.orientation_degrees: \" << sample_.{member_name}().target_location_data().orientation_degrees() << std::endl;")
-                elif member_type == 'VehicleStatus':
-                    data_display.append(f"            std::cout << \"  {member_name}.task_status: \" << static_cast<int>(sample_.{member_name}().task_status()) << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.battery_percentage: \" << sample_.{member_name}().battery_percentage() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.signal_strength_dbm: \" << sample_.{member_name}().signal_strength_dbm() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.system_error: \" << (sample_.{member_name}().system_error() ? \"true\" : \"false\") << std::endl;")
-                elif member_type == 'TargetDetection':
-                    data_display.append(f"            std::cout << \"  {member_name}.target_ID: \" << sample_.{member_name}().target_ID() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.type: \" << static_cast<int>(sample_.{member_name}().type()) << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.location_data.coords.latitude: \" << sample_.{member_name}().location_data().coords().latitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.location_data.coords.longitude: \" << sample_.{member_name}().location_data().coords().longitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.location_data.coords.altitude: \" << sample_.{member_name}().location_data().coords().altitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.location_data.time_info.seconds: \" << sample_.{member_name}().location_data().time_info().seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.location_data.time_info.nano_seconds: \" << sample_.{member_name}().location_data().time_info().nano_seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.location_data.speed_mps: \" << sample_.{member_name}().location_data().speed_mps() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.location_data.orientation_degrees: \" << sample_.{member_name}().location_data().orientation_degrees() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.confidence_level: \" << sample_.{member_name}().confidence_level() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.description: \" << sample_.{member_name}().description() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.raw_data_link: \" << sample_.{member_name}().raw_data_link() << std::endl;")
-                elif member_type == 'TaskCommand':
-                    data_display.append(f"            std::cout << \"  {member_name}.header.sender_id: \" << sample_.{member_name}().header().sender_id() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.header.send_time.seconds: \" << sample_.{member_name}().header().send_time().seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.header.send_time.nano_seconds: \" << sample_.{member_name}().header().send_time().nano_seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.receiver_id: \" << sample_.{member_name}().receiver_id() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.assignment.command: \" << sample_.{member_name}().assignment().command() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.assignment.target_location_data.coords.latitude: \" << sample_.{member_name}().assignment().target_location_data().coords().latitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.assignment.target_location_data.coords.longitude: \" << sample_.{member_name}().assignment().target_location_data().coords().longitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.assignment.target_location_data.coords.altitude: \" << sample_.{member_name}().assignment().target_location_data().coords().altitude() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.assignment.target_location_data.time_info.seconds: \" << sample_.{member_name}().assignment().target_location_data().time_info().seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.assignment.target_location_data.time_info.nano_seconds: \" << sample_.{member_name}().assignment().target_location_data().time_info().nano_seconds() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.assignment.target_location_data.speed_mps: \" << sample_.{member_name}().assignment().target_location_data().speed_mps() << std::endl;")
-                    data_display.append(f"            std::cout << \"  {member_name}.assignment.target_location_data.orientation_degrees: \" << sample_.{member_name}().assignment().target_location_data().orientation_degrees() << std::endl;")
-                else:
-                    data_display.append(f"            std::cout << \"  {member_name}: \" << sample_.{member_name}() << std::endl;")
+            data_display = self._build_data_display(members, "            ", fingerprint)
             
-            # Create new content
-            new_content = content.replace(while_start, while_start + "\n" + "\n".join(data_display))
+            insert_pos = while_match.end()
         else:
             # Fallback: add after sample definition
-            sample_line = match.group(0)
-            data_display = []
-            data_display.append(f"        // Displaying received data")
-            for member_type, member_name in members:
-                # Detailed display for complex types
-                if member_type == 'Coordinates':
-                    data_display.append(f"        std::cout << \"  {member_name}.latitude: \" << sample_.{member_name}().latitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.longitude: \" << sample_.{member_name}().longitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.altitude: \" << sample_.{member_name}().altitude() << std::endl;")
-                elif member_type == 'Timestamp':
-                    data_display.append(f"        std::cout << \"  {member_name}.seconds: \" << sample_.{member_name}().seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.nano_seconds: \" << sample_.{member_name}().nano_seconds() << std::endl;")
-                elif member_type == 'Location':
-                    data_display.append(f"        std::cout << \"  {member_name}.coords.latitude: \" << sample_.{member_name}().coords().latitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.coords.longitude: \" << sample_.{member_name}().coords().longitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.coords.altitude: \" << sample_.{member_name}().coords().altitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.time_info.seconds: \" << sample_.{member_name}().time_info().seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.time_info.nano_seconds: \" << sample_.{member_name}().time_info().nano_seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.speed_mps: \" << sample_.{member_name}().speed_mps() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.orientation_degrees: \" << sample_.{member_name}().orientation_degrees() << std::endl;")
-                elif member_type == 'MessageHeader':
-                    data_display.append(f"        std::cout << \"  {member_name}.sender_id: \" << sample_.{member_name}().sender_id() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.send_time.seconds: \" << sample_.{member_name}().send_time().seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.send_time.nano_seconds: \" << sample_.{member_name}().send_time().nano_seconds() << std::endl;")
-                elif member_type == 'TaskAssignment':
-                    data_display.append(f"        std::cout << \"  {member_name}.command: \" << sample_.{member_name}().command() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.target_location_data.coords.latitude: \" << sample_.{member_name}().target_location_data().coords().latitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.target_location_data.coords.longitude: \" << sample_.{member_name}().target_location_data().coords().longitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.target_location_data.coords.altitude: \" << sample_.{member_name}().target_location_data().coords().altitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.target_location_data.time_info.seconds: \" << sample_.{member_name}().target_location_data().time_info().seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.target_location_data.time_info.nano_seconds: \" << sample_.{member_name}().target_location_data().time_info().nano_seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.target_location_data.speed_mps: \" << sample_.{member_name}().target_location_data().speed_mps() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.target_location_data.orientation_degrees: \" << sample_.{member_name}().target_location_data().orientation_degrees() << std::endl;")
-                elif member_type == 'VehicleStatus':
-                    data_display.append(f"        std::cout << \"  {member_name}.task_status: \" << static_cast<int>(sample_.{member_name}().task_status()) << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.battery_percentage: \" << sample_.{member_name}().battery_percentage() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.signal_strength_dbm: \" << sample_.{member_name}().signal_strength_dbm() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.system_error: \" << (sample_.{member_name}().system_error() ? \"true\" : \"false\") << std::endl;")
-                elif member_type == 'TargetDetection':
-                    data_display.append(f"        std::cout << \"  {member_name}.target_ID: \" << sample_.{member_name}().target_ID() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.type: \" << static_cast<int>(sample_.{member_name}().type()) << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.location_data.coords.latitude: \" << sample_.{member_name}().location_data().coords().latitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.location_data.coords.longitude: \" << sample_.{member_name}().location_data().coords().longitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.location_data.coords.altitude: \" << sample_.{member_name}().location_data().coords().altitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.location_data.time_info.seconds: \" << sample_.{member_name}().location_data().time_info().seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.location_data.time_info.nano_seconds: \" << sample_.{member_name}().location_data().time_info().nano_seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.location_data.speed_mps: \" << sample_.{member_name}().location_data().speed_mps() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.location_data.orientation_degrees: \" << sample_.{member_name}().location_data().orientation_degrees() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.confidence_level: \" << sample_.{member_name}().confidence_level() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.description: \" << sample_.{member_name}().description() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.raw_data_link: \" << sample_.{member_name}().raw_data_link() << std::endl;")
-                elif member_type == 'TaskCommand':
-                    data_display.append(f"        std::cout << \"  {member_name}.header.sender_id: \" << sample_.{member_name}().header().sender_id() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.header.send_time.seconds: \" << sample_.{member_name}().header().send_time().seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.header.send_time.nano_seconds: \" << sample_.{member_name}().header().send_time().nano_seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.receiver_id: \" << sample_.{member_name}().receiver_id() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.assignment.command: \" << sample_.{member_name}().assignment().command() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.assignment.target_location_data.coords.latitude: \" << sample_.{member_name}().assignment().target_location_data().coords().latitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.assignment.target_location_data.coords.longitude: \" << sample_.{member_name}().assignment().target_location_data().coords().longitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.assignment.target_location_data.coords.altitude: \" << sample_.{member_name}().assignment().target_location_data().coords().altitude() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.assignment.target_location_data.time_info.seconds: \" << sample_.{member_name}().assignment().target_location_data().time_info().seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.assignment.target_location_data.time_info.nano_seconds: \" << sample_.{member_name}().assignment().target_location_data().time_info().nano_seconds() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.assignment.target_location_data.speed_mps: \" << sample_.{member_name}().assignment().target_location_data().speed_mps() << std::endl;")
-                    data_display.append(f"        std::cout << \"  {member_name}.assignment.target_location_data.orientation_degrees: \" << sample_.{member_name}().assignment().target_location_data().orientation_degrees() << std::endl;")
-                else:
-                    data_display.append(f"        std::cout << \"  {member_name}: \" << sample_.{member_name}() << std::endl;")
+            data_display = self._build_data_display(members, "        ", fingerprint)
             
-            # Create new content
-            new_content = content.replace(sample_line, sample_line + "\n" + "\n".join(data_display))
+            insert_pos = match.end()
         
-        # Update file
+        # Update file, written as prefix / display block / suffix without building the new content.
+        # If nothing was cleaned and the file is plain ASCII with LF endings, the prefix on disk is already
+        # correct and character offsets are byte offsets, so only the part after the anchor is rewritten.
         try:
-            with open(subscriber_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            if (content == original and content.isascii() and
+                    os.path.getsize(subscriber_file) == len(content)):
+                self._splice_file(subscriber_file, insert_pos, ("\n", data_display, content[insert_pos:]))
+            else:
+                self._write_segments(subscriber_file, (content[:insert_pos], "\n", data_display, content[insert_pos:]))
             return True
         except Exception as e:
             print(f"❌ Subscriber file could not be written: {subscriber_file} - {e}")
@@ -1114,15 +1212,24 @@ class IDLJSONPatcher:
         
         print(f"📁 Found IDL files: {len(idl_files)}")
         for idl_file in idl_files:
-            print(f"   - {idl_file}")
+            log.debug("   - %s", idl_file)
         
         # Process each IDL file
         total_success = 0
         total_files = len(idl_files)
         
-        for idl_file in idl_files:
-            if self.process_idl_file(idl_file):
-                total_success += 1
+        workers = min(total_files, os.cpu_count() or 1)
+        if workers > 1:
+            # IDL files are independent, so patch them in worker processes and print each file's log in order
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for success, output in executor.map(self._process_idl_file_captured, idl_files):
+                    sys.stdout.write(output)
+                    if success:
+                        total_success += 1
+        else:
+            for idl_file in idl_files:
+                if self.process_idl_file(idl_file):
+                    total_success += 1
         
         print("\n" + "=" * 50)
         print(f"🎉 Operation completed!")
@@ -1168,20 +1275,20 @@ class IDLJSONPatcher:
         
         # Check project structure
         required_dirs = ['IDL', 'docs']
-        missing_dirs = []
-        
-        for dir_name in required_dirs:
-            dir_path = Path(self.project_root) / dir_name
-            if not dir_path.exists():
-                missing_dirs.append(dir_name)
+        try:
+            with os.scandir(self.project_root) as it:
+                existing_dirs = {entry.name for entry in it if entry.is_dir()}
+        except OSError:
+            existing_dirs = set()
+        missing_dirs = [dir_name for dir_name in required_dirs if dir_name not in existing_dirs]
         
         if missing_dirs:
             print(f"⚠️  Missing directories: {missing_dirs}")
             return False
         
         # Check IDL files
-        idl_files = list(Path(self.project_root).glob('IDL/*.idl'))
-        if not idl_files:
+        # Cached, so run() reuses this scan when started from the project root
+        if not self._scan_idl_entries(os.path.join(self.project_root, 'IDL')):
             print("⚠️  IDL file not found")
             return False
         
@@ -1190,6 +1297,8 @@ class IDLJSONPatcher:
 
 def main():
     """Main function."""
+    # Per-file details are debug messages, printed bare like the rest of the output when enabled
+    logging.basicConfig(format="%(message)s")
     patcher = IDLJSONPatcher()
     
     # Portability check
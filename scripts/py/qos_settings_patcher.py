@@ -19,48 +19,91 @@ Supported target files:
 
 Notes:
 - Injections are idempotent (marker-based). Does not add again on second run.
-- Original files are backed up before processing.
+- Original files are backed up before they are modified.
 """
 
 import os
-import re
 import sys
+import mmap
 import time
+import pickle
+import hashlib
 import shutil
+import zipfile
+import functools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Prefer the third-party "regex" engine when installed; every pattern below is also valid for "re"
+try:
+    import regex as re
+except ImportError:
+    import re
 
 
 # ————————————————————————————————————————————————————————————————————————
 # User input model and constants
 # ————————————————————————————————————————————————————————————————————————
 
-HISTORY_KIND_ALLOWED = {"KEEP_LAST", "KEEP_ALL"}
+HISTORY_KIND_ALLOWED = frozenset({"KEEP_LAST", "KEEP_ALL"})
 
-# Fast DDS enum/value sets (for validation)
+# Fast DDS enum/value sets (for validation); immutable, shared by the CLI and the GUI
 FASTDDS_QOS_ENUMS = {
-    "ReliabilityQosPolicyKind": {"RELIABLE_RELIABILITY_QOS", "BEST_EFFORT_RELIABILITY_QOS"},
-    "DurabilityQosPolicyKind": {"VOLATILE_DURABILITY_QOS", "TRANSIENT_LOCAL_DURABILITY_QOS"},
-    "HistoryQosPolicyKind": {"KEEP_LAST_HISTORY_QOS", "KEEP_ALL_HISTORY_QOS"},
-    "LivelinessQosPolicyKind": {
+    "ReliabilityQosPolicyKind": frozenset({"RELIABLE_RELIABILITY_QOS", "BEST_EFFORT_RELIABILITY_QOS"}),
+    "DurabilityQosPolicyKind": frozenset({"VOLATILE_DURABILITY_QOS", "TRANSIENT_LOCAL_DURABILITY_QOS"}),
+    "HistoryQosPolicyKind": frozenset({"KEEP_LAST_HISTORY_QOS", "KEEP_ALL_HISTORY_QOS"}),
+    "LivelinessQosPolicyKind": frozenset({
         "AUTOMATIC_LIVELINESS_QOS",
         "MANUAL_BY_TOPIC_LIVELINESS_QOS",
         "MANUAL_BY_PARTICIPANT_LIVELINESS_QOS",
-    },
-    "DestinationOrderQosPolicyKind": {
+    }),
+    "DestinationOrderQosPolicyKind": frozenset({
         "BY_RECEPTION_TIMESTAMP_DESTINATIONORDER_QOS",
         "BY_SOURCE_TIMESTAMP_DESTINATIONORDER_QOS",
-    },
-    "OwnershipQosPolicyKind": {"SHARED_OWNERSHIP_QOS", "EXCLUSIVE_OWNERSHIP_QOS"},
-    "PresentationQosPolicyAccessScopeKind": {
+    }),
+    "OwnershipQosPolicyKind": frozenset({"SHARED_OWNERSHIP_QOS", "EXCLUSIVE_OWNERSHIP_QOS"}),
+    "PresentationQosPolicyAccessScopeKind": frozenset({
         "INSTANCE_PRESENTATION_QOS",
         "TOPIC_PRESENTATION_QOS",
         "GROUP_PRESENTATION_QOS",
-    },
+    }),
 }
 
-# Default, safe and balanced QoS set (History comes from user)
-DEFAULT_QOS = {
+# Menu order of each enum and the position of every value in it (sorted once at import)
+_SORTED_ENUMS = {kind: sorted(values) for kind, values in FASTDDS_QOS_ENUMS.items()}
+_ENUM_INDEX = {kind: {name: i for i, name in enumerate(values)} for kind, values in _SORTED_ENUMS.items()}
+
+# Enum policies of both Writer and Reader, in prompt/validation order: (field, label, enum kind)
+_ENUM_PROMPTS = (
+    ("reliability", "Reliability", "ReliabilityQosPolicyKind"),
+    ("durability", "Durability", "DurabilityQosPolicyKind"),
+    ("liveliness", "Liveliness", "LivelinessQosPolicyKind"),
+    ("destination_order", "DestinationOrder", "DestinationOrderQosPolicyKind"),
+    ("ownership", "Ownership", "OwnershipQosPolicyKind"),
+)
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of a nested config: dicts become mapping proxies, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain-dict copy of a frozen config (mapping proxies cannot be pickled to worker processes)."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
+# Default, safe and balanced QoS set (History comes from user).
+# Frozen so it can be shared by reference; callers build overrides with {**DEFAULT_QOS, ...}
+DEFAULT_QOS = _freeze({
     "writer": {
         "reliability": "RELIABLE_RELIABILITY_QOS",
         "durability": "VOLATILE_DURABILITY_QOS",
@@ -110,13 +153,79 @@ DEFAULT_QOS = {
             "names": [],
         },
     },
-}
+})
+
+
+# ————————————————————————————————————————————————————————————————————————
+# Precompiled patterns
+# ————————————————————————————————————————————————————————————————————————
+# Fixed literals (markers, create_* calls, QoS type names) are located with str.find / `in`;
+# regexes are kept only where whitespace, identifiers or alternatives have to be matched.
+
+_CREATE_READER = "create_datareader("
+_CREATE_WRITER = "create_datawriter("
+
+_RE_READER_QOS_DECL = re.compile(r"\bDataReaderQos\s+(\w+)\s*=")
+_RE_WRITER_QOS_DECL = re.compile(r"\bDataWriterQos\s+(\w+)\s*=")
+# Either declaration, so a file holding both roles is scanned once
+_RE_QOS_DECL = re.compile(r"\bData(Reader|Writer)Qos\s+(\w+)\s*=")
+_RE_LINE_INDENT = re.compile(r"[\t ]*")
+# Start of every line that has non-whitespace content (blank lines are not indented)
+_RE_CONTENT_LINE = re.compile(r"^(?=[^\S\n]*\S)", re.MULTILINE)
+# One module-selection token: anything between whitespace/comma/semicolon separators
+_RE_SELECTION_TOKEN = re.compile(r"[^\s,;]+")
+
+# QoS fields assigned by the patcher, stripped before a block is (re)injected
+_STRIP_FIELDS = (
+    r"reliability\(\)\.kind",
+    r"durability\(\)\.kind",
+    r"liveliness\(\)\.kind",
+    r"destination_order\(\)\.kind",
+    r"ownership\(\)\.kind",
+    r"history\(\)\.kind",
+    r"history\(\)\.depth",
+    r"resource_limits\(\)\.max_samples",
+    r"resource_limits\(\)\.allocated_samples",
+    r"publish_mode\(\)\.kind",
+    r"ownership_strength\(\)\.value",
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _qos_var_decl_pattern(var_name: str) -> "re.Pattern[str]":
+    return re.compile(rf"\b(DataReaderQos|DataWriterQos)\s+{re.escape(var_name)}\s*=")
+
+
+@functools.lru_cache(maxsize=64)
+def _strip_pattern(var_name: str) -> "re.Pattern[str]":
+    # One alternation over all fields, so a segment is scanned once instead of once per field
+    return re.compile(rf"{re.escape(var_name)}\.(?:{'|'.join(_STRIP_FIELDS)})\s*=.*?;\s*\n")
+
+
+# Enum values may be written bare or qualified (eprosima::fastdds::dds::, ReliabilityQosPolicyKind::)
+_ENUM_VALUE = r"(?:\w+::)*(?P<enum>[A-Z_]+)\b"
+
+
+@functools.lru_cache(maxsize=64)
+def _extract_pattern(var_name: str) -> "re.Pattern[str]":
+    # Every extracted field in one alternation: enum kinds report their field in the
+    # "kind" group, the other alternatives are named after the result key they fill
+    return re.compile(
+        rf"{re.escape(var_name)}\.(?:"
+        rf"(?P<kind>reliability|durability|liveliness|destination_order|ownership|history)\(\)\.kind\s*=\s*{_ENUM_VALUE}"
+        r"|history\(\)\.depth\s*=\s*(?P<history_depth>\d+)"
+        r"|resource_limits\(\)\.max_samples\s*=\s*(?P<max_samples>\d+)"
+        r"|resource_limits\(\)\.allocated_samples\s*=\s*(?P<allocated_samples>\d+)"
+        r"|publish_mode\(\)\.kind\s*=\s*(?P<publish_mode_async>(?:\w+::)*ASYNCHRONOUS_PUBLISH_MODE)\b"
+        r"|ownership_strength\(\)\.value\s*=\s*(?P<ownership_strength>\d+))"
+    )
 
 
 # ————————————————————————————————————————————————————————————————————————
 # Helpers
 # ————————————————————————————————————————————————————————————————————————
 
+@functools.lru_cache(maxsize=1)
 def _project_root() -> Path:
     """Dynamically detect project root directory."""
     try:
@@ -126,9 +235,14 @@ def _project_root() -> Path:
     
     current_dir = script_dir
     
-    # Walk up the directory tree to find project root
+    # Walk up the directory tree to find project root (one directory listing per ancestor)
     while current_dir != current_dir.parent:
-        if (current_dir / "IDL").exists() and (current_dir / "scenarios").exists():
+        try:
+            with os.scandir(current_dir) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+        if "IDL" in names and "scenarios" in names:
             return current_dir
         current_dir = current_dir.parent
     
@@ -146,15 +260,76 @@ def _project_root() -> Path:
 
 
 def _find_target_files() -> List[Path]:
+    idl_dir = _project_root() / "IDL"
+    if not idl_dir.is_dir():
+        return []
+    # One scandir pass over IDL/*_idl_generated/ classifies both roles; publishers are listed first
+    publishers: List[Path] = []
+    subscribers: List[Path] = []
+    with os.scandir(idl_dir) as modules:
+        for module in modules:
+            if not (module.name.endswith("_idl_generated") and module.is_dir()):
+                continue
+            with os.scandir(module.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith("PublisherApp.cxx"):
+                        bucket = publishers
+                    elif entry.name.endswith("SubscriberApp.cxx"):
+                        bucket = subscribers
+                    else:
+                        continue
+                    if entry.is_file():
+                        bucket.append(Path(entry.path))
+    return publishers + subscribers
+
+
+_TARGET_CACHE_FILE = Path.home() / ".cache" / "qos_patcher" / "targets.pkl"
+
+
+def _load_target_cache() -> Optional[Tuple[List[Path], Dict[str, Dict[str, Path]]]]:
+    """Cached (files, grouped) scan result, or None when missing or stale."""
+    try:
+        with open(_TARGET_CACHE_FILE, "rb") as fh:
+            cached = pickle.load(fh)
+        if cached["root"] != str(_project_root()):
+            return None
+        # Adding/removing a module dir touches IDL/, adding/removing a target touches its module dir
+        for directory, mtime in cached["mtimes"].items():
+            if os.stat(directory).st_mtime_ns != mtime:
+                return None
+        return cached["files"], cached["grouped"]
+    except Exception:
+        return None
+
+
+def _cached_targets() -> Tuple[List[Path], Dict[str, Dict[str, Path]]]:
+    hit = _load_target_cache()
+    if hit is not None:
+        return hit
     root = _project_root()
-    patterns = [
-        "IDL/*_idl_generated/*PublisherApp.cxx",
-        "IDL/*_idl_generated/*SubscriberApp.cxx",
-    ]
-    results: List[Path] = []
-    for p in patterns:
-        results.extend(root.glob(p))
-    return [r for r in results if r.is_file()]
+    idl_dir = root / "IDL"
+    # Record directory mtimes before scanning, so a change during the scan invalidates the entry
+    mtimes: Dict[str, int] = {}
+    try:
+        mtimes[str(idl_dir)] = os.stat(idl_dir).st_mtime_ns
+        with os.scandir(idl_dir) as modules:
+            for module in modules:
+                if module.name.endswith("_idl_generated") and module.is_dir():
+                    mtimes[module.path] = module.stat().st_mtime_ns
+    except OSError:
+        mtimes = {}
+    files = _find_target_files()
+    grouped = _group_targets_by_module(files)
+    if mtimes:
+        try:
+            _TARGET_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = _TARGET_CACHE_FILE.with_name(_TARGET_CACHE_FILE.name + ".tmp")
+            with open(tmp, "wb") as fh:
+                pickle.dump({"root": str(root), "mtimes": mtimes, "files": files, "grouped": grouped}, fh, protocol=5)
+            os.replace(tmp, _TARGET_CACHE_FILE)
+        except OSError:
+            pass
+    return files, grouped
 
 
 def _group_targets_by_module(files: List[Path]) -> Dict[str, Dict[str, Path]]:
@@ -179,18 +354,18 @@ def _print_target_variations(grouped: Dict[str, Dict[str, Path]]) -> None:
     if not grouped:
         print("(empty)")
         return
-    idx = 1
-    for module, roles in grouped.items():
+    # Collect the listing and print it in one call instead of one print per line
+    lines: List[str] = []
+    for idx, (module, roles) in enumerate(grouped.items(), 1):
         role_list = []
         if "publisher" in roles:
             role_list.append("Publisher")
         if "subscriber" in roles:
             role_list.append("Subscriber")
-        print(f"[{idx}] {module} — {', '.join(role_list)}")
+        lines.append(f"[{idx}] {module} — {', '.join(role_list)}")
         # Sub-paths
-        for r, p in roles.items():
-            print(f"     - {r}: {p}")
-        idx += 1
+        lines.extend(f"     - {r}: {p}" for r, p in roles.items())
+    print("\n".join(lines))
 
 
 def _get_user_module_selection(grouped: Dict[str, Dict[str, Path]]) -> List[str]:
@@ -202,19 +377,19 @@ def _get_user_module_selection(grouped: Dict[str, Dict[str, Path]]) -> List[str]
     sel = input("Selection: ").strip().lower()
     if sel in ("", "all", "*"):
         return modules
-    chosen: List[str] = []
-    for part in re.split(r"[\s,;]+", sel):
-        if not part:
-            continue
-        if not part.isdigit():
+    # Insertion-ordered dict: deduplicates while parsing, keeping first-seen order
+    chosen: Dict[str, None] = {}
+    # findall yields only non-empty tokens, so there are no split artefacts to skip
+    for part in _RE_SELECTION_TOKEN.findall(sel):
+        if not part.isdecimal():
             print(f"Ignored: {part}")
             continue
         i = int(part)
         if 1 <= i <= len(modules):
-            chosen.append(modules[i - 1])
+            chosen[modules[i - 1]] = None
         else:
             print(f"Out of range: {i}")
-    return list(dict.fromkeys(chosen))
+    return list(chosen)
 
 
 def _get_user_role_selection() -> str:
@@ -234,14 +409,39 @@ def _get_user_role_selection() -> str:
         print("Invalid selection.")
 
 
+def _backup_file(f: Path, timestamp: str) -> Path:
+    # Only the contents matter for a backup, so skip copy2's metadata copy
+    # (copyfile already moves the bytes in-kernel via sendfile on Linux)
+    bak = f.with_suffix(f.suffix + f".bak.{timestamp}")
+    shutil.copyfile(str(f), str(bak))
+    return bak
+
+
 def backup_files(files: List[Path]) -> List[Path]:
     timestamp = time.strftime("%Y%m%d_%H%M%S")
-    backups: List[Path] = []
-    for f in files:
-        bak = f.with_suffix(f.suffix + f".bak.{timestamp}")
-        shutil.copy2(str(f), str(bak))
-        backups.append(bak)
-    return backups
+    if len(files) <= 1:
+        return [_backup_file(f, timestamp) for f in files]
+    # Copies are I/O-bound and release the GIL: overlap them, results keep input order
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        return list(executor.map(lambda f: _backup_file(f, timestamp), files))
+
+
+def backup_files_archive(files: List[Path], archive_path: Optional[Path] = None) -> Path:
+    """Back up all files into one uncompressed zip (default: backups/qos_<timestamp>.zip)."""
+    root = _project_root()
+    if archive_path is None:
+        archive_path = root / "backups" / f"qos_{time.strftime('%Y%m%d_%H%M%S')}.zip"
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    # ZIP_STORED: a single archive write per run, no compression cost
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_STORED) as zf:
+        for f in files:
+            f = Path(f)
+            try:
+                arcname = f.resolve().relative_to(root.resolve())
+            except ValueError:
+                arcname = Path(f.name)
+            zf.write(f, arcname=arcname.as_posix())
+    return archive_path
 
 
 def display_qos_menu() -> None:
@@ -282,6 +482,30 @@ def _choose_enum(prompt: str, options: List[str], default_index: int = 0) -> str
         print("Invalid selection.")
 
 
+def _ask_int(prompt: str, default_val: int) -> int:
+    while True:
+        raw = input(f"{prompt} (default {default_val}): ").strip()
+        if raw == "":
+            return default_val
+        if raw.isdigit() and int(raw) > 0:
+            return int(raw)
+        print("Invalid value.")
+
+
+def _run_prompt_table(label: str, cfg: Dict) -> None:
+    # Ask every enum policy of one role, defaulting to its current value
+    for field, field_label, enum_kind in _ENUM_PROMPTS:
+        print(f"{label}.{field_label}:")
+        cfg[field] = _choose_enum("Selection", _SORTED_ENUMS[enum_kind], _ENUM_INDEX[enum_kind][cfg[field]])
+
+
+def _ask_resource_limits(label: str, cfg: Dict) -> None:
+    # cfg is a private deep copy (get_advanced_qos_inputs), so the nested dict is updated in place
+    rl = cfg.setdefault("resource_limits", {})
+    rl["max_samples"] = _ask_int(f"{label}.ResourceLimits.max_samples", rl.get("max_samples", 1000))
+    rl["allocated_samples"] = _ask_int(f"{label}.ResourceLimits.allocated_samples", rl.get("allocated_samples", 50))
+
+
 def get_advanced_qos_inputs(base_qos: Dict[str, Dict], roles: str) -> Tuple[Dict, Dict, Dict[str, Optional[int]]]:
     print("")
     print("=== Advanced QoS: Reader/Writer ===")
@@ -297,40 +521,18 @@ def get_advanced_qos_inputs(base_qos: Dict[str, Dict], roles: str) -> Tuple[Dict
             if d.isdigit() and int(d) > 0:
                 hist = {"kind": "KEEP_LAST", "depth": int(d)}
                 break
-                print("Invalid value.")
+            print("Invalid value.")
     else:
         hist = {"kind": "KEEP_ALL", "depth": None}
 
-    # Enums for both roles
-    rel_opts = sorted(list(FASTDDS_QOS_ENUMS["ReliabilityQosPolicyKind"]))
-    dur_opts = sorted(list(FASTDDS_QOS_ENUMS["DurabilityQosPolicyKind"]))
-    liv_opts = sorted(list(FASTDDS_QOS_ENUMS["LivelinessQosPolicyKind"]))
-    dst_opts = sorted(list(FASTDDS_QOS_ENUMS["DestinationOrderQosPolicyKind"]))
-    own_opts = sorted(list(FASTDDS_QOS_ENUMS["OwnershipQosPolicyKind"]))
+    # Deep plain-dict copies: nested policies (resource_limits) are never shared with base_qos.
+    # copy.deepcopy cannot copy the frozen DEFAULT_QOS mapping proxies, _thaw can
+    writer = _thaw(base_qos["writer"])
+    reader = _thaw(base_qos["reader"])
 
-    writer = dict(base_qos["writer"])  # shallow copy
-    reader = dict(base_qos["reader"])  # shallow copy
-
-    def _ask_int(prompt: str, default_val: int) -> int:
-        while True:
-            raw = input(f"{prompt} (default {default_val}): ").strip()
-            if raw == "":
-                return default_val
-            if raw.isdigit() and int(raw) > 0:
-                return int(raw)
-                print("Invalid value.")
     if roles in ("publisher", "both"):
         print("")
-        print("Writer.Reliability:")
-        writer["reliability"] = _choose_enum("Selection", rel_opts, rel_opts.index(writer["reliability"]))
-        print("Writer.Durability:")
-        writer["durability"] = _choose_enum("Selection", dur_opts, dur_opts.index(writer["durability"]))
-        print("Writer.Liveliness:")
-        writer["liveliness"] = _choose_enum("Selection", liv_opts, liv_opts.index(writer["liveliness"]))
-        print("Writer.DestinationOrder:")
-        writer["destination_order"] = _choose_enum("Selection", dst_opts, dst_opts.index(writer["destination_order"]))
-        print("Writer.Ownership:")
-        writer["ownership"] = _choose_enum("Selection", own_opts, own_opts.index(writer["ownership"]))
+        _run_prompt_table("Writer", writer)
         while True:
             os_raw = input("Writer.OwnershipStrength (int, default 0): ").strip()
             if os_raw == "":
@@ -338,12 +540,12 @@ def get_advanced_qos_inputs(base_qos: Dict[str, Dict], roles: str) -> Tuple[Dict
                 break
             try:
                 os_val = int(os_raw)
-                if os_val >= 0:
-                    writer["ownership_strength"] = os_val
-                    break
-            except Exception:
-                pass
-                print("Invalid value.")
+            except ValueError:
+                os_val = -1
+            if os_val >= 0:
+                writer["ownership_strength"] = os_val
+                break
+            print("Invalid value.")
         while True:
             pm_raw = input("Writer.PublishMode Async? (y/N): ").strip().lower()
             if pm_raw in ("", "n", "no"):
@@ -354,31 +556,21 @@ def get_advanced_qos_inputs(base_qos: Dict[str, Dict], roles: str) -> Tuple[Dict
                 break
             print("Invalid selection.")
         # Resource limits
-        rlw = dict(writer.get("resource_limits", {}))
-        rlw["max_samples"] = _ask_int("Writer.ResourceLimits.max_samples", rlw.get("max_samples", 1000))
-        rlw["allocated_samples"] = _ask_int("Writer.ResourceLimits.allocated_samples", rlw.get("allocated_samples", 50))
-        writer["resource_limits"] = rlw
+        _ask_resource_limits("Writer", writer)
 
     if roles in ("subscriber", "both"):
         print("")
-        print("Reader.Reliability:")
-        reader["reliability"] = _choose_enum("Selection", rel_opts, rel_opts.index(reader["reliability"]))
-        print("Reader.Durability:")
-        reader["durability"] = _choose_enum("Selection", dur_opts, dur_opts.index(reader["durability"]))
-        print("Reader.Liveliness:")
-        reader["liveliness"] = _choose_enum("Selection", liv_opts, liv_opts.index(reader["liveliness"]))
-        print("Reader.DestinationOrder:")
-        reader["destination_order"] = _choose_enum("Selection", dst_opts, dst_opts.index(reader["destination_order"]))
-        print("Reader.Ownership:")
-        reader["ownership"] = _choose_enum("Selection", own_opts, own_opts.index(reader["ownership"]))
-        rlr = dict(reader.get("resource_limits", {}))
-        rlr["max_samples"] = _ask_int("Reader.ResourceLimits.max_samples", rlr.get("max_samples", 1000))
-        rlr["allocated_samples"] = _ask_int("Reader.ResourceLimits.allocated_samples", rlr.get("allocated_samples", 50))
-        reader["resource_limits"] = rlr
+        _run_prompt_table("Reader", reader)
+        _ask_resource_limits("Reader", reader)
 
     return writer, reader, hist
 
 
+def _is_int(value: Any) -> bool:
+    # bool is an int subclass, but True/False are not valid counts
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
 def validate_qos(history: Dict[str, Optional[int]], base_qos: Dict[str, Dict]) -> Tuple[bool, str]:
     # History validation
     kind = history.get("kind")
@@ -387,39 +579,39 @@ def validate_qos(history: Dict[str, Optional[int]], base_qos: Dict[str, Dict]) -
         if kind not in HISTORY_KIND_ALLOWED:
             return False, "History.kind invalid (KEEP_LAST/KEEP_ALL)."
         if kind == "KEEP_LAST":
-            if depth is None or not isinstance(depth, int) or depth <= 0:
+            if depth is None or not _is_int(depth) or depth <= 0:
                 return False, "KEEP_LAST requires positive integer depth."
         if kind == "KEEP_ALL" and depth is not None:
             return False, "KEEP_ALL should not have depth specified."
 
+    # DEFAULT_QOS is frozen, so its verdict never changes: check it once per process
+    if base_qos is DEFAULT_QOS:
+        return _validate_default_qos()
+    return _validate_base_qos(base_qos)
+
+
+@functools.lru_cache(maxsize=1)
+def _validate_default_qos() -> Tuple[bool, str]:
+    return _validate_base_qos(DEFAULT_QOS)
+
+
+def _validate_base_qos(base_qos: Mapping[str, Mapping]) -> Tuple[bool, str]:
     # Writer/Reader enum kontrolleri
     for role in ("writer", "reader"):
         cfg = base_qos.get(role, {})
-        rel = cfg.get("reliability")
-        dur = cfg.get("durability")
-        liv = cfg.get("liveliness")
-        if rel is not None and rel not in FASTDDS_QOS_ENUMS["ReliabilityQosPolicyKind"]:
-            return False, f"{role} reliability invalid."
-        if dur is not None and dur not in FASTDDS_QOS_ENUMS["DurabilityQosPolicyKind"]:
-            return False, f"{role} durability invalid."
-        if liv is not None and liv not in FASTDDS_QOS_ENUMS["LivelinessQosPolicyKind"]:
-            return False, f"{role} liveliness invalid."
-        # DestinationOrder & Ownership
-        dest = cfg.get("destination_order")
-        own = cfg.get("ownership")
-        if dest is not None and dest not in FASTDDS_QOS_ENUMS["DestinationOrderQosPolicyKind"]:
-            return False, f"{role} destination_order invalid."
-        if own is not None and own not in FASTDDS_QOS_ENUMS["OwnershipQosPolicyKind"]:
-            return False, f"{role} ownership invalid."
+        for field, _, enum_kind in _ENUM_PROMPTS:
+            value = cfg.get(field)
+            if value is not None and value not in FASTDDS_QOS_ENUMS[enum_kind]:
+                return False, f"{role} {field} invalid."
 
         rl = cfg.get("resource_limits")
         if rl is not None:
-            if not isinstance(rl, dict):
+            if not isinstance(rl, Mapping):
                 return False, f"{role} resource_limits must be a dictionary."
             for key in ("max_samples", "allocated_samples"):
                 if key in rl:
                     val = rl.get(key)
-                    if not isinstance(val, int) or val <= 0:
+                    if not _is_int(val) or val <= 0:
                         return False, f"{role} resource_limits.{key} must be a positive integer."
 
         if role == "writer":
@@ -429,7 +621,7 @@ def validate_qos(history: Dict[str, Optional[int]], base_qos: Dict[str, Dict]) -
                     return False, "writer publish_mode_async must be boolean."
             if "ownership_strength" in cfg:
                 os_val = cfg.get("ownership_strength")
-                if not isinstance(os_val, int) or os_val < 0:
+                if not _is_int(os_val) or os_val < 0:
                     return False, "writer ownership_strength negatif olamaz."
 
     # Publisher/Subscriber presentation & partition
@@ -446,7 +638,7 @@ def validate_qos(history: Dict[str, Optional[int]], base_qos: Dict[str, Dict]) -
         part = cfg.get("partition")
         if part is not None:
             names = part.get("names", [])
-            if not isinstance(names, list) or not all(isinstance(x, str) for x in names):
+            if not isinstance(names, (list, tuple)) or not all(isinstance(x, str) for x in names):
                 return False, f"{role} partition.names must be array[str]."
 
     return True, "OK"
@@ -458,25 +650,46 @@ def _history_kind_symbol(kind: str) -> str:
     return "KEEP_ALL_HISTORY_QOS"
 
 
+def _block_is_current(block_name: str, content: str, new_block: str) -> bool:
+    # Same block text _inject_or_replace would write, indented like the existing block's first line
+    start_marker = f"// <QoSPatcher:{block_name}:BEGIN>"
+    end_marker = f"// <QoSPatcher:{block_name}:END>"
+    pos = content.find(start_marker)
+    if pos == -1:
+        return False
+    line_start = content.rfind("\n", 0, pos) + 1
+    block = start_marker + "\n" + new_block.rstrip() + "\n" + end_marker
+    return content.startswith(_with_indent(block, content[line_start:pos]), line_start)
+
+
 def _inject_or_replace(block_name: str, content: str, new_block: str) -> str:
     start_marker = f"// <QoSPatcher:{block_name}:BEGIN>"
     end_marker = f"// <QoSPatcher:{block_name}:END>"
-    pattern = re.compile(
-        re.escape(start_marker) + r"[\s\S]*?" + re.escape(end_marker), re.MULTILINE
-    )
     block = start_marker + "\n" + new_block.rstrip() + "\n" + end_marker
-    if pattern.search(content):
-        return pattern.sub(block, content)
+    # Existing block(s): both markers are plain literals, so bracket them with str.find
+    parts: List[str] = []
+    pos = 0
+    start = content.find(start_marker)
+    while start != -1:
+        end = content.find(end_marker, start + len(start_marker))
+        if end == -1:
+            break
+        parts += (content[pos:start], block)
+        pos = end + len(end_marker)
+        start = content.find(start_marker, pos)
+    if parts:
+        parts.append(content[pos:])
+        return "".join(parts)
     # Otherwise add: Place near main QoS usage (before create_datawriter/reader)
     # Heuristic: find create_datawriter or create_datareader line
-    anchor = re.search(r"create_datawriter\(|create_datareader\(", content)
-    if anchor:
+    anchors = [p for p in (content.find(_CREATE_WRITER), content.find(_CREATE_READER)) if p != -1]
+    if anchors:
         # Add block before the LINE WHERE function call STARTS
-        pos = anchor.start()
+        pos = min(anchors)
         line_start = content.rfind("\n", 0, pos)
         insert_pos = 0 if line_start == -1 else line_start + 1
         # Get current line indentation and write block with same indentation
-        indent_match = re.match(r"[\t ]*", content[insert_pos:pos])
+        indent_match = _RE_LINE_INDENT.match(content, insert_pos, pos)
         indent = indent_match.group(0) if indent_match else ""
         indented_block = _with_indent(block, indent)
         return content[:insert_pos] + indented_block + "\n" + content[insert_pos:]
@@ -484,87 +697,119 @@ def _inject_or_replace(block_name: str, content: str, new_block: str) -> str:
     return content.rstrip() + "\n\n" + block + "\n"
 
 
-def _build_qos_assignments_to_var(var_name: str, role: str, qos: Dict, history: Dict[str, Optional[int]]) -> str:
-    hist_kind = _history_kind_symbol(history["kind"]) if history else "KEEP_LAST_HISTORY_QOS"
-    lines: List[str] = []
-    lines.append(f"// <QoSPatcher:{role}_qos:BEGIN>")
-    lines.append(f"// {role.capitalize()} QoS - generated by QoSPatcher")
-    if qos.get("reliability") is not None:
-        lines.append(f"{var_name}.reliability().kind = eprosima::fastdds::dds::{qos['reliability']};")
-    if qos.get("durability") is not None:
-        lines.append(f"{var_name}.durability().kind = eprosima::fastdds::dds::{qos['durability']};")
-    if qos.get("liveliness") is not None:
-        lines.append(f"{var_name}.liveliness().kind = eprosima::fastdds::dds::{qos['liveliness']};")
-    # DestinationOrder
-    if qos.get("destination_order"):
-        lines.append(f"{var_name}.destination_order().kind = eprosima::fastdds::dds::{qos['destination_order']};")
-    # Ownership
-    if qos.get("ownership"):
-        lines.append(f"{var_name}.ownership().kind = eprosima::fastdds::dds::{qos['ownership']};")
-    if history.get("kind") is not None:
-        lines.append(f"{var_name}.history().kind = eprosima::fastdds::dds::{hist_kind};")
-        if history.get("kind") == "KEEP_LAST":
-            lines.append(f"{var_name}.history().depth = {int(history['depth'])};")
+@functools.lru_cache(maxsize=16)
+def _qos_block_template(role: str, history_kind: Optional[str]) -> str:
+    # Fixed shape of the generated block for one (role, history kind); optional lines are
+    # filled in as whole fragments ("" when the field is unset)
+    parts = [
+        f"// <QoSPatcher:{role}_qos:BEGIN>\n",
+        f"// {role.capitalize()} QoS - generated by QoSPatcher (fp: {{fp}})\n",
+        "{reliability}{durability}{liveliness}{destination_order}{ownership}",
+    ]
+    if history_kind is not None:
+        parts.append(f"{{var}}.history().kind = eprosima::fastdds::dds::{_history_kind_symbol(history_kind)};\n")
+        if history_kind == "KEEP_LAST":
+            parts.append("{var}.history().depth = {depth};\n")
+    parts.append("{max_samples}{allocated_samples}")
+    if role == "writer":
+        parts.append("{publish_mode}{ownership_strength}")
+    parts.append(f"// <QoSPatcher:{role}_qos:END>")
+    return "".join(parts)
+
+
+def _qos_fingerprint(role: str, qos: Mapping, history: Dict[str, Optional[int]]) -> str:
+    """Short hash of the settings a role's block is generated from, stamped into the block header."""
+    key = repr((role, _thaw(qos), dict(history)))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _qos_fingerprints(history: Dict[str, Optional[int]], base_qos: Mapping[str, Mapping]) -> Dict[str, str]:
+    """Fingerprint of both roles, computed once per run instead of once per file."""
+    return {role: _qos_fingerprint(role, base_qos[role], history) for role in ("reader", "writer")}
+
+
+def _qos_stamp(role: str, fp: str) -> bytes:
+    return f"// {role.capitalize()} QoS - generated by QoSPatcher (fp: {fp})".encode("utf-8")
+
+
+# Enum policies written as "<var>.<field>().kind = ...": (field, whether empty values count as unset)
+_KIND_LINE_FIELDS = (
+    ("reliability", False),
+    ("durability", False),
+    ("liveliness", False),
+    ("destination_order", True),
+    ("ownership", True),
+)
+_DDS_NS = "eprosima::fastdds::dds::"
+
+
+def _build_qos_assignments_to_var(var_name: str, role: str, qos: Dict, history: Dict[str, Optional[int]],
+                                  fp: Optional[str] = None) -> str:
+    history_kind = history.get("kind")
+    values = {
+        "var": var_name,
+        "fp": fp if fp is not None else _qos_fingerprint(role, qos, history),
+        "depth": int(history["depth"]) if history_kind == "KEEP_LAST" else "",
+        "max_samples": "",
+        "allocated_samples": "",
+        "publish_mode": "",
+        "ownership_strength": "",
+    }
+    for field, skip_empty in _KIND_LINE_FIELDS:
+        value = qos.get(field)
+        is_set = bool(value) if skip_empty else value is not None
+        values[field] = f"{var_name}.{field}().kind = {_DDS_NS}{value};\n" if is_set else ""
     rl = qos.get("resource_limits")
-    if isinstance(rl, dict):
+    if isinstance(rl, Mapping):
         if "max_samples" in rl:
-            lines.append(f"{var_name}.resource_limits().max_samples = {int(rl['max_samples'])};")
+            values["max_samples"] = f"{var_name}.resource_limits().max_samples = {int(rl['max_samples'])};\n"
         if "allocated_samples" in rl:
-            lines.append(f"{var_name}.resource_limits().allocated_samples = {int(rl['allocated_samples'])};")
+            values["allocated_samples"] = f"{var_name}.resource_limits().allocated_samples = {int(rl['allocated_samples'])};\n"
     if role == "writer":
         if qos.get("publish_mode_async") is True:
-            lines.append(f"{var_name}.publish_mode().kind = eprosima::fastdds::dds::ASYNCHRONOUS_PUBLISH_MODE;")
-        if isinstance(qos.get("ownership_strength"), int) and qos.get("ownership_strength") is not None:
-            if int(qos["ownership_strength"]) > 0:
-                lines.append(f"{var_name}.ownership_strength().value = {int(qos['ownership_strength'])};")
-    lines.append(f"// <QoSPatcher:{role}_qos:END>")
-    return "\n".join(lines)
+            values["publish_mode"] = f"{var_name}.publish_mode().kind = {_DDS_NS}ASYNCHRONOUS_PUBLISH_MODE;\n"
+        strength = qos.get("ownership_strength")
+        if isinstance(strength, int) and int(strength) > 0:
+            values["ownership_strength"] = f"{var_name}.ownership_strength().value = {int(strength)};\n"
+    return _qos_block_template(role, history_kind).format_map(values)
 
 
 def _with_indent(block: str, indent: str) -> str:
-    lines = block.splitlines()
-    return "\n".join([(indent + ln if ln.strip() != "" else ln) for ln in lines])
+    # Like splitlines(): a single trailing newline does not produce an extra line
+    if block.endswith("\n"):
+        block = block[:-1]
+    if not indent:
+        return block
+    return _RE_CONTENT_LINE.sub(lambda _m: indent, block)
 
 
-def _strip_qos_assignments(content: str, var_name: str, is_reader: bool) -> str:
+def _strip_qos_assignments(content: str, var_name: str, is_reader: bool,
+                           decl_end: Optional[int] = None) -> str:
     # Clean QoS assignments only between var definition and related create_* call
-    decl = re.search(rf"\b(DataReaderQos|DataWriterQos)\s+{re.escape(var_name)}\s*=", content)
-    if not decl:
+    # (decl_end: end of that definition when the caller already located it in this content)
+    if decl_end is None:
+        decl = _qos_var_decl_pattern(var_name).search(content)
+        if not decl:
+            return content
+        decl_end = decl.end()
+    start = decl_end
+    create = content.find(_CREATE_READER if is_reader else _CREATE_WRITER, start)
+    end = create if create != -1 else len(content)
+    # Assignments to remove (pattern memoized per var); skip rebuilding the file when none matched
+    segment, removed = _strip_pattern(var_name).subn("", content[start:end])
+    if not removed:
         return content
-    start = decl.end()
-    if is_reader:
-        create = re.search(r"create_datareader\(", content[start:])
-    else:
-        create = re.search(r"create_datawriter\(", content[start:])
-    end = (start + create.start()) if create else len(content)
-    segment = content[start:end]
-    # Patterns to remove
-    patterns = [
-        rf"{re.escape(var_name)}\.reliability\(\)\.kind\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.durability\(\)\.kind\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.liveliness\(\)\.kind\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.destination_order\(\)\.kind\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.ownership\(\)\.kind\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.history\(\)\.kind\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.history\(\)\.depth\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.resource_limits\(\)\.max_samples\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.resource_limits\(\)\.allocated_samples\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.publish_mode\(\)\.kind\s*=.*?;\s*\n",
-        rf"{re.escape(var_name)}\.ownership_strength\(\)\.value\s*=.*?;\s*\n",
-    ]
-    for pat in patterns:
-        segment = re.sub(pat, "", segment)
     return content[:start] + segment + content[end:]
 
 
 def _find_qos_var_and_segment(content: str, is_reader: bool) -> Tuple[Optional[str], Optional[str]]:
-    match = re.search(r"\bDataReaderQos\s+(\w+)\s*=" if is_reader else r"\bDataWriterQos\s+(\w+)\s*=", content)
+    match = (_RE_READER_QOS_DECL if is_reader else _RE_WRITER_QOS_DECL).search(content)
     if not match:
         return None, None
     var_name = match.group(1)
     start = match.end()
-    create = re.search(r"create_datareader\(" if is_reader else r"create_datawriter\(", content[start:])
-    end = (start + create.start()) if create else len(content)
+    create = content.find(_CREATE_READER if is_reader else _CREATE_WRITER, start)
+    end = create if create != -1 else len(content)
     return var_name, content[start:end]
 
 
@@ -574,16 +819,19 @@ def extract_qos_from_content(content: str, is_reader: bool) -> Tuple[Dict, Dict[
     var_name, seg = _find_qos_var_and_segment(content, is_reader)
     if not seg:
         return qos, history
-    # Helper to find enum or int assignment
+    # Single pass over the segment; the first assignment of each field wins
+    found: Dict[str, str] = {}
+    for m in _extract_pattern(var_name).finditer(seg):
+        field = m.group("kind")
+        if field:
+            found.setdefault(field, m.group("enum"))
+        else:
+            found.setdefault(m.lastgroup, m.group(m.lastgroup))
     def _find_enum(field: str) -> Optional[str]:
-        m = re.search(rf"{re.escape(var_name)}\\.{field}\\(\\)\\.kind\\s*=\\s*(?:eprosima::fastdds::dds::)?([A-Z_]+)", seg)
-        return m.group(1) if m else None
-    def _find_int(field: str) -> Optional[int]:
-        m = re.search(rf"{re.escape(var_name)}\\.{field}\\(\\)\\.depth\\s*=\\s*(\\d+)", seg)
-        return int(m.group(1)) if m else None
-    def _find_int_direct(pattern: str) -> Optional[int]:
-        m = re.search(pattern, seg)
-        return int(m.group(1)) if m else None
+        return found.get(field)
+    def _find_int(key: str) -> Optional[int]:
+        val = found.get(key)
+        return int(val) if val is not None else None
     # Core
     rel = _find_enum("reliability")
     if rel:
@@ -608,12 +856,12 @@ def extract_qos_from_content(content: str, is_reader: bool) -> Tuple[Dict, Dict[
             history["kind"] = "KEEP_LAST"
         elif hkind.endswith("KEEP_ALL_HISTORY_QOS"):
             history["kind"] = "KEEP_ALL"
-    hdepth = _find_int("history")
+    hdepth = _find_int("history_depth")
     if hdepth is not None:
         history["depth"] = hdepth
     # Resource limits
-    max_samples = _find_int_direct(rf"{re.escape(var_name)}\\.resource_limits\\(\\)\\.max_samples\\s*=\\s*(\\d+)")
-    alloc_samples = _find_int_direct(rf"{re.escape(var_name)}\\.resource_limits\\(\\)\\.allocated_samples\\s*=\\s*(\\d+)")
+    max_samples = _find_int("max_samples")
+    alloc_samples = _find_int("allocated_samples")
     if max_samples or alloc_samples:
         qos["resource_limits"] = {}
         if max_samples is not None:
@@ -622,73 +870,158 @@ def extract_qos_from_content(content: str, is_reader: bool) -> Tuple[Dict, Dict[
             qos["resource_limits"]["allocated_samples"] = alloc_samples
     # Publish mode
     if not is_reader:
-        async_set = re.search(rf"{re.escape(var_name)}\\.publish_mode\\(\\)\\.kind\\s*=\\s*(?:eprosima::fastdds::dds::)?ASYNCHRONOUS_PUBLISH_MODE", seg)
-        qos["publish_mode_async"] = bool(async_set)
-        ostr = _find_int_direct(rf"{re.escape(var_name)}\\.ownership_strength\\(\\)\\.value\\s*=\\s*(\\d+)")
+        qos["publish_mode_async"] = "publish_mode_async" in found
+        ostr = _find_int("ownership_strength")
         if ostr is not None:
             qos["ownership_strength"] = ostr
     return qos, history
 
 
 def extract_qos_from_file(path: Path, is_reader: bool) -> Tuple[Dict, Dict[str, Optional[int]]]:
+    # Only the text up to the first create_* call after the QoS declaration is needed:
+    # stream lines and stop there instead of reading the whole file
+    type_name = "DataReaderQos" if is_reader else "DataWriterQos"
+    decl_re = _RE_READER_QOS_DECL if is_reader else _RE_WRITER_QOS_DECL
+    create_call = _CREATE_READER if is_reader else _CREATE_WRITER
+    lines: List[str] = []
+    declared = False
     try:
-        content = Path(path).read_text(encoding="utf-8")
+        with open(path, "r", encoding="utf-8", buffering=1 << 17) as fh:
+            for line in fh:
+                lines.append(line)
+                start = 0
+                if not declared:
+                    if type_name not in line:
+                        continue
+                    decl = decl_re.search(line)
+                    if not decl:
+                        continue
+                    declared = True
+                    start = decl.end()
+                if line.find(create_call, start) != -1:
+                    break
     except Exception:
         return {}, {"kind": None, "depth": None}
-    return extract_qos_from_content(content, is_reader)
+    return extract_qos_from_content("".join(lines), is_reader)
 
 
-def _patch_single_file(path: Path, history: Dict[str, Optional[int]], base_qos: Dict[str, Dict]) -> bool:
+def _patch_single_file(path: Path, history: Dict[str, Optional[int]], base_qos: Dict[str, Dict],
+                       backup_timestamp: Optional[str] = None,
+                       fingerprints: Optional[Mapping[str, str]] = None) -> bool:
+    if fingerprints is None:
+        fingerprints = _qos_fingerprints(history, base_qos)
     try:
-        original = path.read_text(encoding="utf-8")
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            # Cheap checks on the raw bytes before any decoding or regex:
+            # files without QoS declarations are left alone
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                has_reader = mm.find(b"DataReaderQos") != -1
+                has_writer = mm.find(b"DataWriterQos") != -1
+                if not (has_reader or has_writer):
+                    return False
+                # Blocks stamped with the current settings' fingerprint need no decoding or regex work
+                stamps = []
+                if has_reader:
+                    stamps.append(_qos_stamp("reader", fingerprints["reader"]))
+                if has_writer:
+                    stamps.append(_qos_stamp("writer", fingerprints["writer"]))
+                if all(mm.find(stamp) != -1 for stamp in stamps):
+                    return False
+                original = mm[:].decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
     except Exception:
         return False
 
     content = original
 
-    # Publisher/Subscriber distinction: find QoS variable names
+    # Publisher/Subscriber distinction: find QoS variable names and build their blocks first.
+    # One scan, stopped once every role present in the file has its first declaration; it also
+    # records where the first declaration of each variable name ends (the strip start)
+    wanted = [role for role, present in (("Reader", has_reader), ("Writer", has_writer)) if present]
+    decls: Dict[str, "re.Match[str]"] = {}
+    decl_ends: Dict[str, int] = {}
+    for m in _RE_QOS_DECL.finditer(content):
+        decls.setdefault(m.group(1), m)
+        decl_ends.setdefault(m.group(2), m.end())
+        if all(role in decls for role in wanted):
+            break
+    reader_qos_match = decls.get("Reader") if has_reader else None
+    writer_qos_match = decls.get("Writer") if has_writer else None
+    reader_assign = writer_assign = None
+    if reader_qos_match:
+        reader_assign = _build_qos_assignments_to_var(reader_qos_match.group(2), "reader", base_qos["reader"], history,
+                                                      fingerprints["reader"])
+    if writer_qos_match:
+        writer_assign = _build_qos_assignments_to_var(writer_qos_match.group(2), "writer", base_qos["writer"], history,
+                                                      fingerprints["writer"])
+
+    # Already patched with the same settings: skip stripping, injection and the write
+    if ((reader_assign is None or _block_is_current("reader_qos", content, reader_assign)) and
+            (writer_assign is None or _block_is_current("writer_qos", content, writer_assign))):
+        return False
+
     # Reader
-    reader_qos_match = re.search(r"\bDataReaderQos\s+(\w+)\s*=", content)
     if reader_qos_match:
-        reader_qos_var = reader_qos_match.group(1)
         # Clean old assignments
-        content = _strip_qos_assignments(content, reader_qos_var, is_reader=True)
-        # Add/update QoS assignments before create_datareader call
-        reader_assign = _build_qos_assignments_to_var(reader_qos_var, "reader", base_qos["reader"], history)
+        reader_var = reader_qos_match.group(2)
+        content = _strip_qos_assignments(content, reader_var, is_reader=True, decl_end=decl_ends[reader_var])
         # Injection point: immediately before create_datareader call
         content = _inject_or_replace("reader_qos", content, reader_assign)
 
     # Writer
-    writer_qos_match = re.search(r"\bDataWriterQos\s+(\w+)\s*=", content)
     if writer_qos_match:
-        writer_qos_var = writer_qos_match.group(1)
-        content = _strip_qos_assignments(content, writer_qos_var, is_reader=False)
-        writer_assign = _build_qos_assignments_to_var(writer_qos_var, "writer", base_qos["writer"], history)
+        # Recorded positions are only valid while the reader pass has not rewritten the content
+        writer_var = writer_qos_match.group(2)
+        content = _strip_qos_assignments(content, writer_var, is_reader=False,
+                                         decl_end=decl_ends[writer_var] if content is original else None)
         content = _inject_or_replace("writer_qos", content, writer_assign)
 
     if content == original:
         return False
 
+    tmp = path.with_name(path.name + ".tmp")
     try:
-        path.write_text(content, encoding="utf-8")
+        # Back up just before the first write, so unchanged files are never copied
+        if backup_timestamp is not None:
+            _backup_file(path, backup_timestamp)
+        # Write beside the target and swap it in, so an interrupted run never leaves a half-written file
+        with open(tmp, "w", encoding="utf-8", buffering=1 << 18) as w:
+            w.write(content)
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
         return True
     except Exception:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
         return False
 
 
 def apply_qos_patch(history: Dict[str, Optional[int]],
-                    target_files: Optional[List[Path]] = None) -> Dict[str, List[Path]]:
+                    target_files: Optional[List[Path]] = None,
+                    base_qos: Optional[Dict[str, Dict]] = None) -> Dict[str, List[Path]]:
     files = target_files if target_files is not None else _find_target_files()
     if not files:
         return {"patched": [], "skipped": []}
+    qos = base_qos if base_qos is not None else DEFAULT_QOS
 
-    backups = backup_files(files)
-    del backups  # only for guarantee, summary will return separately
+    # Every file is backed up lazily by its own patch
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    # Settings are the same for every file: fingerprint them once
+    fingerprints = _qos_fingerprints(history, qos)
+    workers = min(len(files), os.cpu_count() or 1)
+    if len(files) >= 4 and workers > 1:
+        # Files are independent and the regex work is CPU-bound, so patch them in worker processes
+        patch = functools.partial(_patch_single_file, history=history, base_qos=_thaw(qos),
+                                  backup_timestamp=timestamp, fingerprints=fingerprints)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(patch, files))
+    else:
+        results = [_patch_single_file(f, history, qos, timestamp, fingerprints) for f in files]
 
     patched: List[Path] = []
     skipped: List[Path] = []
-    for f in files:
-        ok = _patch_single_file(f, history, DEFAULT_QOS)
+    for f, ok in zip(files, results):
         if ok:
             patched.append(f)
         else:
@@ -699,14 +1032,11 @@ def apply_qos_patch(history: Dict[str, Optional[int]],
 def print_summary(result: Dict[str, List[Path]]) -> None:
     patched = result.get("patched", [])
     skipped = result.get("skipped", [])
-    print("")
-    print("=== QoS Patch Summary ===")
-    print(f"Patched: {len(patched)}")
-    for p in patched:
-        print(f"  - {p}")
-    print(f"Skipped/Unchanged: {len(skipped)}")
-    for s in skipped:
-        print(f"  - {s}")
+    lines = ["", "=== QoS Patch Summary ===", f"Patched: {len(patched)}"]
+    lines.extend(f"  - {p}" for p in patched)
+    lines.append(f"Skipped/Unchanged: {len(skipped)}")
+    lines.extend(f"  - {s}" for s in skipped)
+    print("\n".join(lines))
 
 
 def main() -> None:
@@ -714,12 +1044,11 @@ def main() -> None:
     root = _project_root()
     print(f"Project root: {root}")
 
-    all_files = _find_target_files()
+    all_files, grouped = _cached_targets()
     if not all_files:
         print("⚠️  Target file not found (IDL/*_idl_generated/*PublisherApp.cxx | *SubscriberApp.cxx)")
         sys.exit(0)
 
-    grouped = _group_targets_by_module(all_files)
     _print_target_variations(grouped)
     selected_modules = _get_user_module_selection(grouped)
     if not selected_modules:
@@ -749,12 +1078,12 @@ def main() -> None:
     mode = input("Selection (1-2): ").strip()
     if mode == "2":
         writer_qos_cfg, reader_qos_cfg, history = get_advanced_qos_inputs(DEFAULT_QOS, role_sel)
-        # Merge into a working copy of defaults
-        effective_qos = {
+        # Merge into a working copy of defaults, frozen like DEFAULT_QOS: it is shared by every file
+        effective_qos = _freeze({
             **DEFAULT_QOS,
             "writer": writer_qos_cfg,
             "reader": reader_qos_cfg,
-        }
+        })
     else:
         history = get_history_input()
         effective_qos = DEFAULT_QOS
@@ -765,22 +1094,8 @@ def main() -> None:
         print("Changes not applied.")
         sys.exit(1)
 
-    # Patch with the effective config by temporarily swapping DEFAULT_QOS usage
-    result_files = []
-    patched: List[Path] = []
-    skipped: List[Path] = []
-    files = chosen_files
-    if not files:
-        print("No files found matching selected criteria.")
-        sys.exit(0)
-    backup_files(files)
-    for f in files:
-        okfile = _patch_single_file(f, history, effective_qos)
-        if okfile:
-            patched.append(f)
-        else:
-            skipped.append(f)
-    result = {"patched": patched, "skipped": skipped}
+    # Patch with the effective config; only files that change are backed up
+    result = apply_qos_patch(history, chosen_files, effective_qos)
     print_summary(result)
 
 
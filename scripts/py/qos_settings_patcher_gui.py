@@ -14,7 +14,10 @@ Features:
 
 import sys
 import os
+import threading
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Tuple
 import tkinter as tk
 from tkinter import ttk, messagebox
 
@@ -45,9 +48,16 @@ if str(SCRIPT_DIR) not in sys.path:
 try:
     import qos_settings_patcher as qp
 except Exception as e:
-        messagebox.showerror("Import Error", f"qos_settings_patcher.py could not be imported: {e}")
+    messagebox.showerror("Import Error", f"qos_settings_patcher.py could not be imported: {e}")
     raise
 
+# Combobox options: placeholder + enum values in qp's (import-time sorted) menu order
+_REL_OPTS = ["Select"] + qp._SORTED_ENUMS["ReliabilityQosPolicyKind"]
+_DUR_OPTS = ["Select"] + qp._SORTED_ENUMS["DurabilityQosPolicyKind"]
+_LIV_OPTS = ["Select"] + qp._SORTED_ENUMS["LivelinessQosPolicyKind"]
+_DST_OPTS = ["Select"] + qp._SORTED_ENUMS["DestinationOrderQosPolicyKind"]
+_OWN_OPTS = ["Select"] + qp._SORTED_ENUMS["OwnershipQosPolicyKind"]
+
 
 class QosPatcherGUI(tk.Tk):
     def __init__(self) -> None:
@@ -56,9 +66,24 @@ class QosPatcherGUI(tk.Tk):
         self.geometry("900x700")
         self.minsize(800, 600)
 
-        # Data
-        self.all_files = qp._find_target_files()
-        self.grouped = qp._group_targets_by_module(self.all_files)
+        # Data: filled in by after_idle_init once the window is up
+        self.all_files = []
+        self.grouped = {}
+        # Target file text keyed by path, validated by mtime (autofill re-reads on every selection change)
+        self._file_cache: Dict[Path, Tuple[int, str]] = {}
+        # Parsed QoS per (path, mtime_ns, is_reader): unchanged files are not re-parsed either
+        self._extract_cache: Dict[Tuple[str, int, bool], Tuple[dict, dict]] = {}
+        # Set by _bind_autofill; re-applied after mode changes
+        self._sync_numeric_state = None
+        # Advanced widgets are built on the first switch to advanced mode (_sync_mode_state)
+        self._adv_built = False
+        self._adv_widgets = []
+        # Pending debounced autofill and the (modules, roles) selection it last filled from
+        self._autofill_after_id = None
+        self._last_autofill_key = None
+        # Idle-time dispatcher state: one pending flush, and whether it should autofill first
+        self._sync_after_id = None
+        self._pending_autofill = False
 
         # UI (grid-based, full-screen responsive)
         self._build_ui()
@@ -124,9 +149,9 @@ class QosPatcherGUI(tk.Tk):
         self.adv_canvas.configure(yscrollcommand=adv_scroll.set)
         self.adv_canvas.grid(row=0, column=0, sticky="nsew")
         adv_scroll.grid(row=0, column=1, sticky="ns")
-        # Fill advanced widgets
-        self._build_advanced_section(self.adv_frame)
-        self._attach_tooltips()
+        # Advanced variables exist from the start (autofill and Save read them); the widgets
+        # bound to them are only created once advanced mode is selected
+        self._create_advanced_vars()
 
         # Bottom: Buttons
         bottom = ttk.Frame(self)
@@ -145,32 +170,39 @@ class QosPatcherGUI(tk.Tk):
         top.columnconfigure(0, weight=1)
         top.rowconfigure(1, weight=1)
         # Canvas boyutunu pencere ile senkronla
+        # A drag-resize fires <Configure> per pixel (and for every child widget): keep only the
+        # window's latest width and apply it once on idle, skipping widths already set
+        self._canvas_width = {"applied": -1, "pending": None, "after_id": None}
+
+        def _apply_canvas_width():
+            state = self._canvas_width
+            state["after_id"] = None
+            if state["pending"] != state["applied"]:
+                state["applied"] = state["pending"]
+                self.adv_canvas.configure(width=state["applied"])
+
         def _sync_canvas_width(event):
-            self.adv_canvas.configure(width=event.width - 16)
+            if event.widget is not self:
+                return
+            state = self._canvas_width
+            state["pending"] = event.width - 16
+            if state["after_id"] is None:
+                state["after_id"] = self.after_idle(_apply_canvas_width)
         self.bind("<Configure>", _sync_canvas_width)
 
     def _populate_modules(self) -> None:
         self.modules_list.delete(0, tk.END)
-        for module in sorted(self.grouped.keys()):
-            roles = []
-            if "publisher" in self.grouped[module]:
-                roles.append("Publisher")
-            if "subscriber" in self.grouped[module]:
-                roles.append("Subscriber")
-            self.modules_list.insert(tk.END, f"{module} — {', '.join(roles)}")
-
-    def _build_advanced_section(self, parent: ttk.LabelFrame) -> None:
-        # Enums
-        enums = qp.FASTDDS_QOS_ENUMS
-        rel_opts = sorted(list(enums["ReliabilityQosPolicyKind"]))
-        dur_opts = sorted(list(enums["DurabilityQosPolicyKind"]))
-        liv_opts = sorted(list(enums["LivelinessQosPolicyKind"]))
-        dst_opts = sorted(list(enums["DestinationOrderQosPolicyKind"]))
-        own_opts = sorted(list(enums["OwnershipQosPolicyKind"]))
-
-        # Writer widgets
-        wf = ttk.LabelFrame(parent, text="Writer QoS")
-        wf.pack(fill=tk.X, padx=10, pady=8)
+        items = []
+        for module in sorted(self.grouped):
+            roles = [label for role, label in (("publisher", "Publisher"), ("subscriber", "Subscriber"))
+                     if role in self.grouped[module]]
+            items.append(f"{module} — {', '.join(roles)}")
+        # One Tcl call for the whole list instead of one insert per module
+        if items:
+            self.modules_list.insert(tk.END, *items)
+
+    def _create_advanced_vars(self) -> None:
+        # Writer variables
         self.w_rel = tk.StringVar(value="Select")
         self.w_dur = tk.StringVar(value="Select")
         self.w_liv = tk.StringVar(value="Select")
@@ -181,17 +213,34 @@ class QosPatcherGUI(tk.Tk):
         self.w_rl_max = tk.StringVar(value="")
         self.w_rl_alloc = tk.StringVar(value="")
         self.w_rl_enable = tk.BooleanVar(value=False)
+        # Reader variables
+        self.r_rel = tk.StringVar(value="Select")
+        self.r_dur = tk.StringVar(value="Select")
+        self.r_liv = tk.StringVar(value="Select")
+        self.r_dst = tk.StringVar(value="Select")
+        self.r_own = tk.StringVar(value="Select")
+        self.r_rl_max = tk.StringVar(value="")
+        self.r_rl_alloc = tk.StringVar(value="")
+        self.r_rl_enable = tk.BooleanVar(value=False)
 
-        self.w_rel_cb = self._row_writer(wf, "Reliability", self.w_rel, ["Select"] + rel_opts, 0)
-        self.w_dur_cb = self._row_writer(wf, "Durability", self.w_dur, ["Select"] + dur_opts, 1)
-        self.w_liv_cb = self._row_writer(wf, "Liveliness", self.w_liv, ["Select"] + liv_opts, 2)
-        self.w_dst_cb = self._row_writer(wf, "DestinationOrder", self.w_dst, ["Select"] + dst_opts, 3)
-        self.w_own_cb = self._row_writer(wf, "Ownership", self.w_own, ["Select"] + own_opts, 4)
+    def _build_advanced_section(self, parent: ttk.LabelFrame) -> None:
+        # Writer widgets
+        wf = ttk.LabelFrame(parent, text="Writer QoS")
+        wf.pack(fill=tk.X, padx=10, pady=8)
+        self.w_rel_cb, self.w_dur_cb, self.w_liv_cb, self.w_dst_cb, self.w_own_cb = self._enum_rows(wf, (
+            ("Reliability", self.w_rel, _REL_OPTS),
+            ("Durability", self.w_dur, _DUR_OPTS),
+            ("Liveliness", self.w_liv, _LIV_OPTS),
+            ("DestinationOrder", self.w_dst, _DST_OPTS),
+            ("Ownership", self.w_own, _OWN_OPTS),
+        ))
         ttk.Label(wf, text="OwnershipStrength").grid(row=5, column=0, sticky="e", padx=6, pady=4)
         self.w_ostr_entry = ttk.Entry(wf, textvariable=self.w_ostr, width=10)
         self.w_ostr_entry.grid(row=5, column=1, sticky="w")
-        ttk.Checkbutton(wf, text="PublishMode Async", variable=self.w_async).grid(row=5, column=2, sticky="w")
-        ttk.Checkbutton(wf, text="Set ResourceLimits", variable=self.w_rl_enable).grid(row=6, column=0, sticky="e", padx=6, pady=4)
+        w_async_chk = ttk.Checkbutton(wf, text="PublishMode Async", variable=self.w_async)
+        w_async_chk.grid(row=5, column=2, sticky="w")
+        w_rl_chk = ttk.Checkbutton(wf, text="Set ResourceLimits", variable=self.w_rl_enable)
+        w_rl_chk.grid(row=6, column=0, sticky="e", padx=6, pady=4)
         self.w_rl_max_entry = ttk.Entry(wf, textvariable=self.w_rl_max, width=10)
         self.w_rl_max_entry.grid(row=6, column=1, sticky="w")
         ttk.Label(wf, text="allocated_samples").grid(row=6, column=2, sticky="e", padx=6, pady=4)
@@ -201,54 +250,85 @@ class QosPatcherGUI(tk.Tk):
         # Reader widgets
         rf = ttk.LabelFrame(parent, text="Reader QoS")
         rf.pack(fill=tk.X, padx=10, pady=8)
-        self.r_rel = tk.StringVar(value="Select")
-        self.r_dur = tk.StringVar(value="Select")
-        self.r_liv = tk.StringVar(value="Select")
-        self.r_dst = tk.StringVar(value="Select")
-        self.r_own = tk.StringVar(value="Select")
-        self.r_rl_max = tk.StringVar(value="")
-        self.r_rl_alloc = tk.StringVar(value="")
-        self.r_rl_enable = tk.BooleanVar(value=False)
-
-        self.r_rel_cb = self._row_reader(rf, "Reliability", self.r_rel, ["Select"] + rel_opts, 0)
-        self.r_dur_cb = self._row_reader(rf, "Durability", self.r_dur, ["Select"] + dur_opts, 1)
-        self.r_liv_cb = self._row_reader(rf, "Liveliness", self.r_liv, ["Select"] + liv_opts, 2)
-        self.r_dst_cb = self._row_reader(rf, "DestinationOrder", self.r_dst, ["Select"] + dst_opts, 3)
-        self.r_own_cb = self._row_reader(rf, "Ownership", self.r_own, ["Select"] + own_opts, 4)
-        ttk.Checkbutton(rf, text="Set ResourceLimits", variable=self.r_rl_enable).grid(row=5, column=0, sticky="e", padx=6, pady=4)
+        self.r_rel_cb, self.r_dur_cb, self.r_liv_cb, self.r_dst_cb, self.r_own_cb = self._enum_rows(rf, (
+            ("Reliability", self.r_rel, _REL_OPTS),
+            ("Durability", self.r_dur, _DUR_OPTS),
+            ("Liveliness", self.r_liv, _LIV_OPTS),
+            ("DestinationOrder", self.r_dst, _DST_OPTS),
+            ("Ownership", self.r_own, _OWN_OPTS),
+        ))
+        r_rl_chk = ttk.Checkbutton(rf, text="Set ResourceLimits", variable=self.r_rl_enable)
+        r_rl_chk.grid(row=5, column=0, sticky="e", padx=6, pady=4)
         self.r_rl_max_entry = ttk.Entry(rf, textvariable=self.r_rl_max, width=10)
         self.r_rl_max_entry.grid(row=5, column=1, sticky="w")
         ttk.Label(rf, text="allocated_samples").grid(row=5, column=2, sticky="e", padx=6, pady=4)
         self.r_rl_alloc_entry = ttk.Entry(rf, textvariable=self.r_rl_alloc, width=10)
         self.r_rl_alloc_entry.grid(row=5, column=3, sticky="w")
 
+        # Every input the mode switch toggles, with the state it takes in advanced mode
+        combos = (self.w_rel_cb, self.w_dur_cb, self.w_liv_cb, self.w_dst_cb, self.w_own_cb,
+                  self.r_rel_cb, self.r_dur_cb, self.r_liv_cb, self.r_dst_cb, self.r_own_cb)
+        inputs = (self.w_ostr_entry, w_async_chk, w_rl_chk, self.w_rl_max_entry, self.w_rl_alloc_entry,
+                  r_rl_chk, self.r_rl_max_entry, self.r_rl_alloc_entry)
+        self._adv_widgets = [(cb, "readonly") for cb in combos] + [(w, tk.NORMAL) for w in inputs]
+
         # Grid expansion for writer/reader frames
         for f in (wf, rf):
             for c in range(1, 4):
                 f.columnconfigure(c, weight=1)
 
-    def _row_writer(self, parent, label, var, options, row):
-        ttk.Label(parent, text=label).grid(row=row, column=0, sticky="e", padx=6, pady=4)
-        cb = ttk.Combobox(parent, values=options, textvariable=var, state="readonly", width=48)
-        cb.grid(row=row, column=1, columnspan=3, sticky="w")
-        cb._qos_label = label
-        return cb
-
-    def _row_reader(self, parent, label, var, options, row):
-        ttk.Label(parent, text=label).grid(row=row, column=0, sticky="e", padx=6, pady=4)
-        cb = ttk.Combobox(parent, values=options, textvariable=var, state="readonly", width=48)
-        cb.grid(row=row, column=1, columnspan=3, sticky="w")
-        cb._qos_label = label
-        return cb
+    def _enum_rows(self, parent, specs):
+        # Label + Combobox per (label, var, options), rows 0..n-1; widgets first, then one layout pass
+        rows = []
+        for label, var, options in specs:
+            cb = ttk.Combobox(parent, values=options, textvariable=var, state="readonly", width=48)
+            cb._qos_label = label
+            rows.append((ttk.Label(parent, text=label), cb))
+        for row, (lbl, cb) in enumerate(rows):
+            lbl.grid(row=row, column=0, sticky="e", padx=6, pady=4)
+            cb.grid(row=row, column=1, columnspan=3, sticky="w")
+        return [cb for _, cb in rows]
 
     def _sync_mode_state(self) -> None:
         adv = self.mode.get() == "advanced"
-        state = tk.NORMAL if adv else tk.DISABLED
-        for child in self.adv_frame.winfo_children():
-            try:
-                child.configure(state=state)
-            except Exception:
-                pass
+        if adv and not self._adv_built:
+            # Simple-mode sessions never pay for the advanced widgets
+            self._build_advanced_section(self.adv_frame)
+            self._attach_tooltips()
+            self._adv_built = True
+        for widget, enabled_state in self._adv_widgets:
+            widget.configure(state=(enabled_state if adv else tk.DISABLED))
+        # Entries gated by other selections follow their own rules in advanced mode
+        if self._sync_numeric_state is not None:
+            self._sync_numeric_state()
+
+    def _read_cached(self, path: Path) -> str:
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        text = Path(path).read_text(encoding="utf-8")
+        self._file_cache[path] = (mtime, text)
+        return text
+
+    def _extract_qos(self, path: Path, is_reader: bool):
+        try:
+            key = (str(path), os.stat(path).st_mtime_ns, is_reader)
+            cached = self._extract_cache.get(key)
+            if cached is None:
+                cached = qp.extract_qos_from_content(self._read_cached(path), is_reader)
+                self._extract_cache[key] = cached
+            return cached
+        except Exception:
+            return {}, {"kind": None, "depth": None}
+
+    def _forget_file(self, path: Path) -> None:
+        # Drop cached text and parse results after the file was rewritten
+        self._file_cache.pop(path, None)
+        for key in [k for k in self._extract_cache if k[0] == str(path)]:
+            del self._extract_cache[key]
+        # The same selection must autofill again from the rewritten file
+        self._last_autofill_key = None
 
     def _selected_modules(self):
         indices = self.modules_list.curselection()
@@ -373,17 +453,32 @@ class QosPatcherGUI(tk.Tk):
             messagebox.showerror("Validation", f"QoS validation error: {reason}")
             return
 
-        # Apply patch
-        qp.backup_files(chosen_files)
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Apply patch: every worker reads the same frozen settings, nothing is copied per file
+        history = MappingProxyType(history)
+        effective_qos = qp._freeze(effective_qos)
+        backup_archive = qp.backup_files_archive(chosen_files)
+        # Settings are the same for every file: fingerprint them once. The archive above is the
+        # backup, so the workers make no per-file copies (backup_timestamp=None)
+        fingerprints = qp._qos_fingerprints(history, effective_qos)
+        # Files are independent and mostly I/O-bound: patch them concurrently, then report in order
+        with ThreadPoolExecutor(max_workers=min(32, len(chosen_files))) as executor:
+            results = list(executor.map(
+                lambda f: qp._patch_single_file(Path(f), history, effective_qos,
+                                                backup_timestamp=None, fingerprints=fingerprints),
+                chosen_files))
         patched, skipped = [], []
-        for f in chosen_files:
-            if qp._patch_single_file(Path(f), history, effective_qos):
+        for f, ok in zip(chosen_files, results):
+            if ok:
+                self._forget_file(f)
                 patched.append(f)
             else:
                 skipped.append(f)
 
         # Summary
         msg = ["QoS Patch Summary:"]
+        msg.append(f"Backup: {backup_archive}")
         msg.append(f"Patched: {len(patched)}")
         for p in patched:
             msg.append(f"  - {p}")
@@ -397,10 +492,15 @@ class QosPatcherGUI(tk.Tk):
 
     # Auto-fill: scan existing QoS when module/role selections change
     def _autofill_from_code(self) -> None:
+        self._autofill_after_id = None
         modules = self._selected_modules()
         roles = self._selected_roles()
         if not modules or roles == "none":
             return
+        key = (tuple(modules), roles)
+        if key == self._last_autofill_key:
+            return
+        self._last_autofill_key = key
         # Base on first matching file (for UI simplicity)
         chosen_files = []
         for m in modules:
@@ -414,7 +514,7 @@ class QosPatcherGUI(tk.Tk):
         # Reader
         reader_file = next((f for f in chosen_files if str(f).endswith("SubscriberApp.cxx")), None)
         if reader_file:
-            rqos, rhist = qp.extract_qos_from_file(reader_file, is_reader=True)
+            rqos, rhist = self._extract_qos(reader_file, is_reader=True)
             # History
             if rhist.get("kind") in ("KEEP_LAST", "KEEP_ALL"):
                 self.hist_kind.set(rhist["kind"])
@@ -440,7 +540,7 @@ class QosPatcherGUI(tk.Tk):
         # Writer
         writer_file = next((f for f in chosen_files if str(f).endswith("PublisherApp.cxx")), None)
         if writer_file:
-            wqos, whist = qp.extract_qos_from_file(writer_file, is_reader=False)
+            wqos, whist = self._extract_qos(writer_file, is_reader=False)
             # History (single UI field, also show in configuration)
             if whist.get("kind") in ("KEEP_LAST", "KEEP_ALL"):
                 self.hist_kind.set(whist["kind"])
@@ -470,40 +570,60 @@ class QosPatcherGUI(tk.Tk):
     def _bind_autofill(self) -> None:
         # Auto-fill when module list and role checks change
         def _on_sel_change(*args):
-            self._autofill_from_code()
+            # Debounce: a burst of list/checkbox changes triggers one autofill
+            if self._autofill_after_id is not None:
+                self.after_cancel(self._autofill_after_id)
+            self._autofill_after_id = self.after(150, lambda: self._schedule_sync(autofill=True))
         self.modules_list.bind("<<ListboxSelect>>", lambda e: _on_sel_change())
         self.role_pub.trace_add("write", lambda *a: _on_sel_change())
         self.role_sub.trace_add("write", lambda *a: _on_sel_change())
         # Enable/disable numeric fields based on selections
         def _sync_numeric_state(*args):
+            adv = self.mode.get() == "advanced"
             # History depth only if KEEP_LAST
             hd_state = tk.NORMAL if self.hist_kind.get() == "KEEP_LAST" else tk.DISABLED
             try:
                 self.hist_depth_entry.configure(state=hd_state)
             except Exception:
                 pass
+            if not self._adv_built:
+                return
             # Writer ownership_strength only if ownership set
-            wos_state = tk.NORMAL if self.w_own.get() != "Select" else tk.DISABLED
+            wos_state = tk.NORMAL if adv and self.w_own.get() != "Select" else tk.DISABLED
             try:
                 self.w_ostr_entry.configure(state=wos_state)
             except Exception:
                 pass
             # Resource limits only if enable checked
             try:
-                self.w_rl_max_entry.configure(state=(tk.NORMAL if self.w_rl_enable.get() else tk.DISABLED))
-                self.w_rl_alloc_entry.configure(state=(tk.NORMAL if self.w_rl_enable.get() else tk.DISABLED))
-                self.r_rl_max_entry.configure(state=(tk.NORMAL if self.r_rl_enable.get() else tk.DISABLED))
-                self.r_rl_alloc_entry.configure(state=(tk.NORMAL if self.r_rl_enable.get() else tk.DISABLED))
+                self.w_rl_max_entry.configure(state=(tk.NORMAL if adv and self.w_rl_enable.get() else tk.DISABLED))
+                self.w_rl_alloc_entry.configure(state=(tk.NORMAL if adv and self.w_rl_enable.get() else tk.DISABLED))
+                self.r_rl_max_entry.configure(state=(tk.NORMAL if adv and self.r_rl_enable.get() else tk.DISABLED))
+                self.r_rl_alloc_entry.configure(state=(tk.NORMAL if adv and self.r_rl_enable.get() else tk.DISABLED))
             except Exception:
                 pass
-        # Bind changes
-        self.hist_kind.trace_add("write", _sync_numeric_state)
-        self.w_own.trace_add("write", _sync_numeric_state)
-        self.w_rl_enable.trace_add("write", _sync_numeric_state)
-        self.r_rl_enable.trace_add("write", _sync_numeric_state)
+        # Bind changes: every trace goes through the idle dispatcher, so the burst of writes an
+        # autofill makes ends in a single state pass
+        for var in (self.hist_kind, self.w_own, self.w_rl_enable, self.r_rl_enable):
+            var.trace_add("write", lambda *a: self._schedule_sync())
+        self._sync_numeric_state = _sync_numeric_state
         # Initial state
         _sync_numeric_state()
 
+    def _schedule_sync(self, autofill: bool = False) -> None:
+        self._pending_autofill = self._pending_autofill or autofill
+        if self._sync_after_id is None:
+            self._sync_after_id = self.after_idle(self._flush_sync)
+
+    def _flush_sync(self) -> None:
+        # Traces fired while flushing see the pending id and are absorbed into this pass
+        if self._pending_autofill:
+            self._pending_autofill = False
+            self._autofill_from_code()
+        if self._sync_numeric_state is not None:
+            self._sync_numeric_state()
+        self._sync_after_id = None
+
     def _attach_tooltips(self) -> None:
         # Simple tooltip utility
         tips = {
@@ -547,15 +667,39 @@ class QosPatcherGUI(tk.Tk):
         for cb in (self.r_rel_cb, self.r_dur_cb, self.r_liv_cb, self.r_dst_cb, self.r_own_cb):
             bind_tooltip(cb, cb._qos_label)
 
+    def _load_targets_async(self) -> None:
+        # Scan for target files off the Tk thread; only the main thread touches widgets
+        result = {}
+
+        def _scan():
+            result["targets"] = qp._cached_targets()
+
+        worker = threading.Thread(target=_scan, daemon=True)
+        worker.start()
+
+        def _poll():
+            if worker.is_alive():
+                self.after(20, _poll)
+                return
+            self.all_files, self.grouped = result.get("targets", ([], {}))
+            self._populate_modules()
+            self._autofill_from_code()
+
+        _poll()
+
     # Call initially
     def after_idle_init(self) -> None:
         self._bind_autofill()
-        self._autofill_from_code()
+        self._load_targets_async()
 
 
-if __name__ == "__main__":
+def main() -> None:
     app = QosPatcherGUI()
-    app.after(200, app.after_idle_init)
+    app.after_idle(app.after_idle_init)
     app.mainloop()
 
 
+if __name__ == "__main__":
+    main()
+
+
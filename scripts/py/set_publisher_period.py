@@ -7,11 +7,111 @@ This script modifies the period_ms_ value in all PublisherApp.hpp files.
 
 import os
 import re
-import glob
+import mmap
 import sys
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+# Publisher period declaration: const uint32_t period_ms_ = <value>;
+_RE_PERIOD = re.compile(r'(const\s+uint32_t\s+period_ms_\s*=\s*)(\d+)(\s*;)')
+_PERIOD_NAME = 'period_ms_'
+_PERIOD_PREFIX = 'const uint32_t '
+_PERIOD_NAME_BYTES = _PERIOD_NAME.encode('ascii')
+# Directory suffix of the fastddsgen output folders (IDL/<name>_idl_generated)
+_GENERATED_SUFFIX = '_idl_generated'
+# Bytes after a period_ms_ mention that hold the rest of a canonical declaration
+_PERIOD_WINDOW = 64
+
+
+def _period_value_spans(content: str) -> List[Tuple[int, int]]:
+    """(start, end) of every period_ms_ value in content.
+
+    Generated headers declare period_ms_ once, in canonical form: that case is parsed
+    with find and a digit scan. Anything else falls back to _RE_PERIOD.
+    """
+    i = content.find(_PERIOD_NAME)
+    if i == -1:
+        return []
+    if content.find(_PERIOD_NAME, i + 1) == -1 and content.startswith(_PERIOD_PREFIX, i - len(_PERIOD_PREFIX)):
+        n = len(content)
+        j = i + len(_PERIOD_NAME)
+        while j < n and content[j].isspace():
+            j += 1
+        if j < n and content[j] == '=':
+            j += 1
+            while j < n and content[j].isspace():
+                j += 1
+            start = j
+            while j < n and content[j].isdecimal():
+                j += 1
+            end = j
+            while j < n and content[j].isspace():
+                j += 1
+            if end > start and j < n and content[j] == ';':
+                return [(start, end)]
+    return [match.span(2) for match in _RE_PERIOD.finditer(content)]
+
+
+def _splice_period(content: str, spans: List[Tuple[int, int]], new_period: int) -> str:
+    """content with the new value spliced over every period_ms_ value span."""
+    pieces = []
+    cursor = 0
+    for start, end in spans:
+        pieces.append(content[cursor:start])
+        pieces.append(str(new_period))
+        cursor = end
+    pieces.append(content[cursor:])
+    return ''.join(pieces)
+
+
+def _mapped_period_span(mm: mmap.mmap) -> Optional[Tuple[int, int]]:
+    """Byte span of the period_ms_ value in a mapped file that mentions period_ms_ once.
+
+    Only a small window around the mention is decoded and parsed; None means the caller
+    has to read the whole file (no or several mentions, or an unusual declaration).
+    """
+    idx = mm.find(_PERIOD_NAME_BYTES)
+    if idx == -1 or mm.find(_PERIOD_NAME_BYTES, idx + 1) != -1:
+        return None
+    base = max(0, idx - len(_PERIOD_PREFIX))
+    # One character per byte, so window offsets are file offsets
+    window = mm[base:idx + _PERIOD_WINDOW].decode('ascii', errors='replace')
+    spans = _period_value_spans(window)
+    if len(spans) != 1:
+        return None
+    start, end = spans[0]
+    return base + start, base + end
+
+
+# Each standalone script in scripts/py carries its own copy (they import nothing from each other)
+def _has_idl_and_scenarios(path: str) -> bool:
+    """Whether a directory holds both "IDL" and "scenarios" (project root marker), from one listing."""
+    wanted = {"IDL", "scenarios"}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                wanted.discard(entry.name)
+                if not wanted:
+                    return True
+    except OSError:
+        pass
+    return False
+
+
+class _FileInfo:
+    """One publisher header in the interactive flow (slots: no per-instance dict)."""
+    __slots__ = ('index', 'path', 'rel_path', 'display_name', 'current_period', 'new_period')
+    
+    def __init__(self, index: int, path: str, rel_path: str, display_name: str,
+                 current_period: Optional[int], new_period: Optional[int] = None):
+        self.index = index
+        self.path = path
+        self.rel_path = rel_path
+        self.display_name = display_name
+        self.current_period = current_period
+        self.new_period = new_period
 
 
 class PeriodSetter:
@@ -23,6 +123,8 @@ class PeriodSetter:
         """Initialize the Period Setter."""
         self.project_root = project_root or self._detect_project_root()
         self.idl_dir = os.path.join(self.project_root, "IDL")
+        # Header paths are built under project_root, so their relative path is a prefix strip
+        self._root_prefix = os.path.join(os.path.normpath(self.project_root), '')
         
     def _detect_project_root(self) -> str:
         """Detect the project root directory."""
@@ -30,8 +132,7 @@ class PeriodSetter:
         
         # Look for characteristic directories
         while current_dir != os.path.dirname(current_dir):  # Not at filesystem root
-            if (os.path.exists(os.path.join(current_dir, "IDL")) and 
-                os.path.exists(os.path.join(current_dir, "scenarios"))):
+            if _has_idl_and_scenarios(current_dir):
                 return current_dir
             current_dir = os.path.dirname(current_dir)
         
@@ -46,29 +147,40 @@ class PeriodSetter:
             print(f"ERROR: IDL directory not found: {self.idl_dir}")
             return publisher_files
         
-        # Find all *_idl_generated directories
-        idl_generated_dirs = glob.glob(os.path.join(self.idl_dir, "*_idl_generated"))
-        
-        for idl_dir in idl_generated_dirs:
-            # Find PublisherApp.hpp files in each directory
-            pattern = os.path.join(idl_dir, "*PublisherApp.hpp")
-            files = glob.glob(pattern)
-            publisher_files.extend(files)
+        # Find all *_idl_generated directories, then the PublisherApp.hpp files in each:
+        # one directory listing per level, DirEntry type checks use the cached entry type
+        # (hidden entries are skipped, as glob did)
+        with os.scandir(self.idl_dir) as modules:
+            for module in modules:
+                if module.name.startswith('.') or not module.name.endswith(_GENERATED_SUFFIX) or not module.is_dir():
+                    continue
+                with os.scandir(module.path) as entries:
+                    for entry in entries:
+                        if (entry.name.endswith("PublisherApp.hpp") and not entry.name.startswith('.')
+                                and entry.is_file()):
+                            publisher_files.append(entry.path)
         
         return sorted(publisher_files)
     
     def get_current_period(self, file_path: str) -> Optional[int]:
         """Get the current period_ms_ value from a file."""
         try:
+            # Usual case: find the single declaration in the mapped file without reading it all
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        span = _mapped_period_span(mm)
+                        if span is not None:
+                            return int(mm[span[0]:span[1]])
+            
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Pattern to match: const uint32_t period_ms_ = <value>;
-            pattern = r'const\s+uint32_t\s+period_ms_\s*=\s*(\d+)\s*;'
-            match = re.search(pattern, content)
+            spans = _period_value_spans(content)
             
-            if match:
-                return int(match.group(1))
+            if spans:
+                start, end = spans[0]
+                return int(content[start:end])
             return None
         except Exception as e:
             print(f"ERROR reading {file_path}: {e}")
@@ -77,16 +189,24 @@ class PeriodSetter:
     def set_period(self, file_path: str, new_period: int) -> bool:
         """Set the period_ms_ value in a file."""
         try:
+            # Same number of digits: overwrite them in place in the mapped file, no rewrite
+            value = str(new_period).encode('ascii')
+            with open(file_path, 'r+b') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0) as mm:
+                        span = _mapped_period_span(mm)
+                        if span is not None and span[1] - span[0] == len(value):
+                            if mm[span[0]:span[1]] == value:
+                                print(f"  WARNING: No period_ms_ found in {file_path}")
+                                return False
+                            mm[span[0]:span[1]] = value
+                            mm.flush()
+                            return True
+            
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Pattern to match: const uint32_t period_ms_ = <value>;
-            pattern = r'(const\s+uint32_t\s+period_ms_\s*=\s*)(\d+)(\s*;)'
-            
-            def replace_func(match):
-                return f"{match.group(1)}{new_period}{match.group(3)}"
-            
-            new_content = re.sub(pattern, replace_func, content)
+            new_content = _splice_period(content, _period_value_spans(content), new_period)
             
             if new_content == content:
                 print(f"  WARNING: No period_ms_ found in {file_path}")
@@ -100,13 +220,48 @@ class PeriodSetter:
             print(f"ERROR updating {file_path}: {e}")
             return False
     
+    def _read_and_patch(self, file_path: str, new_period: int) -> Tuple[Optional[int], bool]:
+        """Read a file once, write the new period_ms_ value back if it differs: (old period, changed)."""
+        path = Path(file_path)
+        try:
+            content = path.read_text(encoding='utf-8')
+        except Exception as e:
+            print(f"ERROR reading {file_path}: {e}")
+            return None, False
+        
+        spans = _period_value_spans(content)
+        if not spans:
+            return None, False
+        start, end = spans[0]
+        old_period = int(content[start:end])
+        
+        new_content = _splice_period(content, spans, new_period)
+        if new_content == content:
+            return old_period, False
+        try:
+            path.write_text(new_content, encoding='utf-8')
+        except Exception as e:
+            print(f"ERROR updating {file_path}: {e}")
+            return old_period, False
+        return old_period, True
+    
+    def _rel_path(self, file_path: str) -> str:
+        """file_path relative to the project root (os.path.relpath only for paths outside it)."""
+        if file_path.startswith(self._root_prefix):
+            return file_path[len(self._root_prefix):]
+        return os.path.relpath(file_path, self.project_root)
+    
     def get_file_display_name(self, file_path: str) -> str:
         """Get a short display name for the file."""
         # Extract the IDL name from path like: IDL/CoreData3_idl_generated/CoreData3PublisherApp.hpp
+        # The generated directory is normally the file's parent: plain slicing, no path split
+        parent = os.path.basename(os.path.dirname(file_path))
+        if parent.endswith(_GENERATED_SUFFIX):
+            return parent[:-len(_GENERATED_SUFFIX)]
         parts = os.path.normpath(file_path).split(os.sep)
         for part in parts:
-            if part.endswith('_idl_generated'):
-                return part.replace('_idl_generated', '')
+            if part.endswith(_GENERATED_SUFFIX):
+                return part.replace(_GENERATED_SUFFIX, '')
         return os.path.basename(file_path)
     
     def run_interactive(self) -> bool:
@@ -128,18 +283,11 @@ class PeriodSetter:
         # Show all files with their current values
         file_info = []
         for idx, file_path in enumerate(publisher_files, 1):
-            rel_path = os.path.relpath(file_path, self.project_root)
+            rel_path = self._rel_path(file_path)
             display_name = self.get_file_display_name(file_path)
             current_period = self.get_current_period(file_path)
             
-            file_info.append({
-                'index': idx,
-                'path': file_path,
-                'rel_path': rel_path,
-                'display_name': display_name,
-                'current_period': current_period,
-                'new_period': None
-            })
+            file_info.append(_FileInfo(idx, file_path, rel_path, display_name, current_period))
             
             period_str = f"{current_period} ms" if current_period is not None else "NOT FOUND"
             print(f"  {idx}. {display_name:20s} - Current: {period_str}")
@@ -153,25 +301,24 @@ class PeriodSetter:
         print()
         
         # Ask for each file's new period value
-        for file_item in file_info:
-            current_str = f"{file_item['current_period']} ms" if file_item['current_period'] is not None else "NOT FOUND"
+        for position, file_item in enumerate(file_info):
+            current_str = f"{file_item.current_period} ms" if file_item.current_period is not None else "NOT FOUND"
             
             while True:
-                user_input = input(f"[{file_item['index']}/{len(file_info)}] {file_item['display_name']:20s} "
+                user_input = input(f"[{file_item.index}/{len(file_info)}] {file_item.display_name:20s} "
                                  f"(Current: {current_str}): ").strip().lower()
                 
                 # Check for exit command
                 if user_input in ['exit', 'q', 'quit']:
                     print("\nExit selected. Applying changes...")
-                    # Mark remaining files as "skip" (None)
-                    for remaining in file_info[file_info.index(file_item):]:
-                        if remaining['new_period'] is None:
-                            remaining['new_period'] = remaining['current_period']  # Keep current
+                    # Remaining files (from this one on) have no value yet: keep their current one
+                    for remaining in file_info[position:]:
+                        remaining.new_period = remaining.current_period
                     return self._apply_changes(file_info)
                 
                 # Empty input means keep current value
                 if user_input == '':
-                    file_item['new_period'] = file_item['current_period']  # Keep current
+                    file_item.new_period = file_item.current_period  # Keep current
                     print(f"  -> Keeping current value: {current_str}")
                     break
                 
@@ -181,7 +328,7 @@ class PeriodSetter:
                     if new_period <= 0:
                         print("  ERROR: Period must be a positive integer! Please try again.")
                         continue
-                    file_item['new_period'] = new_period
+                    file_item.new_period = new_period
                     print(f"  -> New value: {new_period} ms")
                     break
                 except ValueError:
@@ -193,7 +340,7 @@ class PeriodSetter:
         print("All files processed. Applying changes...")
         return self._apply_changes(file_info)
     
-    def _apply_changes(self, file_info: List[dict]) -> bool:
+    def _apply_changes(self, file_info: List[_FileInfo]) -> bool:
         """Apply the changes to files."""
         print()
         print("=" * 60)
@@ -205,9 +352,9 @@ class PeriodSetter:
         skipped_count = 0
         
         for file_item in file_info:
-            rel_path = file_item['rel_path']
-            current_period = file_item['current_period']
-            new_period = file_item['new_period']
+            rel_path = file_item.rel_path
+            current_period = file_item.current_period
+            new_period = file_item.new_period
             
             if new_period is None:
                 print(f"SKIPPED: {rel_path} (no value specified)")
@@ -226,7 +373,7 @@ class PeriodSetter:
             print(f"UPDATING: {rel_path}")
             print(f"  {current_period} ms -> {new_period} ms")
             
-            if self.set_period(file_item['path'], new_period):
+            if self.set_period(file_item.path, new_period):
                 print(f"  ✓ Success")
                 success_count += 1
             else:
@@ -252,19 +399,26 @@ class PeriodSetter:
         
         print(f"Found {len(publisher_files)} PublisherApp.hpp file(s):")
         for f in publisher_files:
-            print(f"  - {os.path.relpath(f, self.project_root)}")
+            print(f"  - {self._rel_path(f)}")
         print()
         
+        # Files are independent I/O-bound read-modify-writes: overlap them on threads,
+        # one read (and at most one write) per file; results come back in file order
+        if len(publisher_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(32, len(publisher_files))) as executor:
+                results = list(executor.map(lambda f: self._read_and_patch(f, new_period), publisher_files))
+        else:
+            results = [self._read_and_patch(f, new_period) for f in publisher_files]
+        
         success_count = 0
-        for file_path in publisher_files:
-            rel_path = os.path.relpath(file_path, self.project_root)
-            current_period = self.get_current_period(file_path)
+        for file_path, (current_period, changed) in zip(publisher_files, results):
+            rel_path = self._rel_path(file_path)
             
             if current_period is not None:
                 print(f"Updating {rel_path}:")
                 print(f"  Current period: {current_period} ms")
                 
-                if self.set_period(file_path, new_period):
+                if changed:
                     print(f"  New period: {new_period} ms")
                     success_count += 1
                 else:
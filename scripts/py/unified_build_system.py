@@ -11,9 +11,46 @@ import sys
 import platform
 import subprocess
 import shutil
+import functools
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
+
+# Each standalone script in scripts/py carries its own copy (they import nothing from each other)
+def _has_idl_and_scenarios(path: str) -> bool:
+    """Whether a directory holds both "IDL" and "scenarios" (project root marker), from one listing."""
+    wanted = {"IDL", "scenarios"}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                wanted.discard(entry.name)
+                if not wanted:
+                    return True
+    except OSError:
+        pass
+    return False
+
+
+# Build outputs that are not project executables: CMake tools / compiler checks on Windows,
+# libraries and objects on Linux (one tuple startswith/endswith call each)
+_SKIP_PREFIXES_WIN = ('cmake', 'CompilerIdC')
+_SKIP_SUFFIXES_LINUX = ('.so', '.o', '.a')
+
+
+def _has_exec_bit(entry: os.DirEntry) -> bool:
+    """Any executable bit set on the entry's target; dangling or unreadable entries are not executable."""
+    try:
+        return bool(entry.stat().st_mode & 0o111)
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=32)
+def _which(name: str) -> Optional[str]:
+    """shutil.which, searched once per tool (dependency check and generator choice both ask)."""
+    return shutil.which(name)
+
+
 class UnifiedBuilder:
     """Cross-platform build system for DDS project."""
     
@@ -41,7 +78,7 @@ class UnifiedBuilder:
         
         # Walk up the directory tree to find project root
         while current_dir != current_dir.parent:
-            if (current_dir / "IDL").exists() and (current_dir / "scenarios").exists():
+            if _has_idl_and_scenarios(str(current_dir)):
                 return str(current_dir.absolute())
             current_dir = current_dir.parent
         
@@ -64,30 +101,30 @@ class UnifiedBuilder:
         deps = {}
         
         # CMake check
-        deps['cmake'] = shutil.which('cmake') is not None
+        deps['cmake'] = _which('cmake') is not None
         
         # Build system check
         if self.is_windows:
             # MSBuild or Ninja for Windows
-            deps['msbuild'] = shutil.which('msbuild') is not None
-            deps['ninja'] = shutil.which('ninja') is not None
+            deps['msbuild'] = _which('msbuild') is not None
+            deps['ninja'] = _which('ninja') is not None
             deps['build_system'] = deps['msbuild'] or deps['ninja']
         else:
             # Make or Ninja for Linux
-            deps['make'] = shutil.which('make') is not None
-            deps['ninja'] = shutil.which('ninja') is not None
+            deps['make'] = _which('make') is not None
+            deps['ninja'] = _which('ninja') is not None
             deps['build_system'] = deps['make'] or deps['ninja']
         
         # Fast-DDS check
-        deps['fastddsgen'] = shutil.which('fastddsgen') is not None
+        deps['fastddsgen'] = _which('fastddsgen') is not None
         
         # Compiler check
         if self.is_windows:
             # Visual Studio compiler (cl.exe) usually not in PATH
             deps['compiler'] = True  # If MSBuild exists, compiler also exists
         else:
-            deps['gcc'] = shutil.which('gcc') is not None
-            deps['g++'] = shutil.which('g++') is not None
+            deps['gcc'] = _which('gcc') is not None
+            deps['g++'] = _which('g++') is not None
             deps['compiler'] = deps['gcc'] and deps['g++']
         
         return deps
@@ -127,12 +164,12 @@ class UnifiedBuilder:
     def get_cmake_generator(self) -> str:
         """Returns appropriate CMake generator for platform."""
         if self.is_windows:
-            if shutil.which('ninja'):
+            if _which('ninja'):
                 return "Ninja"
             else:
                 return "Visual Studio 17 2022"  # VS 2022
         else:
-            if shutil.which('ninja'):
+            if _which('ninja'):
                 return "Ninja"
             else:
                 return "Unix Makefiles"
@@ -160,15 +197,15 @@ class UnifiedBuilder:
             cmd.extend(['-A', 'x64'])
         
         try:
-            result = subprocess.run(cmd, cwd=self.project_root, 
-                                  capture_output=True, text=True)
+            # Output stays raw bytes: it is only decoded (stderr) when configuration fails
+            result = subprocess.run(cmd, cwd=self.project_root, capture_output=True)
             
             if result.returncode == 0:
                 print("✅ CMake configuration successful!")
                 return True
             else:
                 print("❌ CMake configuration failed!")
-                print(f"Error: {result.stderr}")
+                print(f"Error: {result.stderr.decode('utf-8', errors='replace')}")
                 return False
                 
         except Exception as e:
@@ -213,19 +250,33 @@ class UnifiedBuilder:
         """Find built executables."""
         executables = []
         
-        # Search for executables in build directory
+        # Search for executables in build directory: explicit scandir stack, top-down like os.walk
+        # (subdirectories are pushed in reverse so they are visited in listing order)
         if self.build_dir.exists():
-            for root, dirs, files in os.walk(self.build_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    
-                    # .exe for Windows, executable bit for Linux
-                    if self.is_windows and file.endswith('.exe'):
-                        if not file.startswith('cmake') and not file.startswith('CompilerIdC'):
-                            executables.append(file_path)
-                    elif self.is_linux and os.access(file_path, os.X_OK):
-                        if not file.startswith('.') and not file.endswith('.so'):
-                            executables.append(file_path)
+            stack = [str(self.build_dir)]
+            while stack:
+                subdirs = []
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            # Like os.walk: symlinked directories are not files, and are not followed
+                            if entry.is_dir():
+                                if not entry.is_symlink():
+                                    subdirs.append(entry.path)
+                                continue
+                            file = entry.name
+                            
+                            # .exe for Windows, executable bit for Linux
+                            if self.is_windows and file.endswith('.exe'):
+                                if not file.startswith(_SKIP_PREFIXES_WIN):
+                                    executables.append(Path(entry.path))
+                            elif self.is_linux and not file.startswith('.') and not file.endswith(_SKIP_SUFFIXES_LINUX):
+                                if _has_exec_bit(entry):
+                                    executables.append(Path(entry.path))
+                except OSError:
+                    # Directory could not be (fully) listed: keep what was found in it
+                    pass
+                stack.extend(reversed(subdirs))
         
         return executables
     